@@ -1,9 +1,22 @@
+from django.utils.decorators import method_decorator
 from django.views.generic.base import TemplateView
 
+from core.cache import cache_page_tagged
+from core.replica import replica_reads
 
+# Статические страницы меняются только с релизом — кешируем без срока.
+cache_forever = method_decorator(
+    cache_page_tagged('about', timeout=None), name='dispatch')
+read_only = method_decorator(replica_reads, name='dispatch')
+
+
+@read_only
+@cache_forever
 class AboutAuthorView(TemplateView):
     template_name = 'about/author.html'
 
 
+@read_only
+@cache_forever
 class AboutTechView(TemplateView):
     template_name = 'about/tech.html'
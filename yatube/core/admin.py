@@ -0,0 +1,30 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import OutgoingEmail, Task
+from .tasks import requeue
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_at',
+                    'dedup_key',)
+    list_filter = ('status', 'name',)
+    search_fields = ('name', 'dedup_key',)
+    readonly_fields = ('locked_at', 'last_error', 'created',)
+    actions = ('retry',)
+
+    def retry(self, request, queryset):
+        failed = queryset.filter(status=Task.FAILED).values_list(
+            'pk', flat=True)
+        for task_id in failed:
+            requeue(task_id, attempts=0, run_at=timezone.now())
+        self.message_user(request, f'Снова в очереди: {len(failed)}')
+    retry.short_description = 'Повторить упавшие задачи'
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'subject', 'attempts', 'next_attempt', 'created',)
+    search_fields = ('subject', 'recipients',)
+    readonly_fields = ('claim', 'claimed_at', 'last_error', 'created',)
@@ -0,0 +1,92 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+TAG_VERSION_KEY = 'tag-version:{}'
+TAG_MODIFIED_KEY = 'tag-modified:{}'
+
+
+def _initial_version():
+    # Версия после вытеснения из кеша не должна совпасть со старой,
+    # поэтому начинаем отсчёт от текущего времени, а не с единицы.
+    return int(time.time() * 1000)
+
+
+def get_tag_versions(tags):
+    """Текущие версии тегов; отсутствующие в кеше заводятся заново."""
+    keys = {TAG_VERSION_KEY.format(tag): tag for tag in tags}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, _initial_version(), None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def get_tag_modified(tags):
+    """Когда последний раз менялся любой из тегов (Unix time).
+
+    Для тегов, которых нет в кеше, время изменения неизвестно: считаем,
+    что они поменялись сейчас.
+    """
+    keys = [TAG_MODIFIED_KEY.format(tag) for tag in tags]
+    modified = cache.get_many(keys)
+    now = time.time()
+    for key in set(keys) - modified.keys():
+        cache.add(key, now, None)
+        modified[key] = cache.get(key, now)
+    return max(modified.values())
+
+
+def bump_tag_versions(*tags):
+    for tag in set(tags):
+        key = TAG_VERSION_KEY.format(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), None)
+    now = time.time()
+    cache.set_many({TAG_MODIFIED_KEY.format(tag): now for tag in tags},
+                   None)
+
+
+PAGE_CACHE_KEY = 'page-cache:{}'
+
+
+def page_cache_timeout():
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 10)
+
+
+def tag_page(request, *tags, timeout=DEFAULT_TIMEOUT):
+    """Разрешить AnonymousPageCacheMiddleware закешировать ответ.
+
+    Запись живёт, пока не сменится версия одного из тегов. Вызывать до
+    чтения данных: версии запоминаются здесь, и правка во время рендера
+    сделает запись устаревшей. Повторный вызов добавляет теги.
+    timeout=None — хранить без срока.
+    """
+    if timeout is DEFAULT_TIMEOUT:
+        timeout = page_cache_timeout()
+    versions = getattr(request, 'page_cache_versions', {})
+    versions.update(get_tag_versions(tags))
+    request.page_cache_versions = versions
+    request.page_cache_timeout = timeout
+
+
+def cache_page_tagged(*tags, timeout=DEFAULT_TIMEOUT):
+    """Декоратор для страниц с постоянным набором тегов."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped_view(request, *args, **kwargs):
+            tag_page(request, *tags, timeout=timeout)
+            return view_func(request, *args, **kwargs)
+        return wrapped_view
+    return decorator
+
+
+def page_cache_key(request):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return PAGE_CACHE_KEY.format(f'{request.method}:{url}')
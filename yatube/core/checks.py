@@ -0,0 +1,53 @@
+"""Проверки настроек для manage.py check и запуска сервера."""
+from django.conf import settings
+from django.core.checks import Error, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+def is_process_local_cache(alias):
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    return backend in PROCESS_LOCAL_CACHES
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Кеш default виден всем процессам.
+
+    Через него воркер refresh_snapshots сообщает веб-процессам, что
+    снимок ленты готов, а записи из run_tasks и команд сбрасывают
+    версии лент. С кешем в памяти процесса снимки не отдаются никогда,
+    а страницы устаревают до истечения срока.
+    """
+    if not is_process_local_cache('default'):
+        return []
+    return [Error(
+        'Кеш default хранится в памяти процесса и не виден другим '
+        'процессам.',
+        hint='Задайте общий кеш: файловый, memcached и т. п. '
+             '(YATUBE_CACHE_BACKEND и YATUBE_CACHE_LOCATION).',
+        id='core.E001',
+    )]
+
+
+@register()
+def check_session_cache(app_configs, **kwargs):
+    """Сессии core.sessions читаются из общего кеша.
+
+    Иначе после выхода, flush() или смены пароля в одном процессе
+    другие продолжат принимать старую сессию из своего кеша, пока
+    запись там не истечёт, — вплоть до SESSION_COOKIE_AGE.
+    """
+    if settings.SESSION_ENGINE != 'core.sessions':
+        return []
+    if not is_process_local_cache(settings.SESSION_CACHE_ALIAS):
+        return []
+    return [Error(
+        f'Кеш сессий {settings.SESSION_CACHE_ALIAS!r} хранится в памяти '
+        'процесса: закрытая сессия останется действующей в других '
+        'процессах.',
+        hint='Задайте общий кеш или другой SESSION_ENGINE.',
+        id='core.E002',
+    )]
@@ -0,0 +1,132 @@
+"""Исходящая почта через очередь в базе.
+
+EMAIL_BACKEND = 'core.mail.OutboxBackend' ничего не отправляет сам:
+send_mail, сброс пароля и любые другие письма только сохраняются в
+OutgoingEmail, а после коммита в очередь задач ставится send_outbox —
+одна на все письма, что успеют накопиться. send_outbox отправляет их
+пачками через OUTBOX_EMAIL_BACKEND, открыв соединение (для SMTP — одно
+рукопожатие) один раз на всю отправку.
+"""
+import json
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+from .tasks import enqueue, enqueue_on_commit, retry_delay
+
+OUTBOX_TASK_KEY = 'outbox'
+
+logger = logging.getLogger('yatube.mail')
+
+
+def to_outgoing(message):
+    if message.attachments:
+        raise ValueError('Письма с вложениями очередь не принимает')
+    return OutgoingEmail(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        recipients=json.dumps({
+            'to': message.to,
+            'cc': message.cc,
+            'bcc': message.bcc,
+            'reply_to': message.reply_to,
+        }),
+        headers=json.dumps(message.extra_headers),
+        alternatives=json.dumps(getattr(message, 'alternatives', [])),
+        next_attempt=timezone.now(),
+    )
+
+
+def to_message(email, connection):
+    return EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        headers=json.loads(email.headers),
+        alternatives=json.loads(email.alternatives),
+        connection=connection,
+        **json.loads(email.recipients),
+    )
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Кладёт письма в очередь вместо отправки."""
+
+    def send_messages(self, email_messages):
+        emails = [to_outgoing(message) for message in email_messages
+                  if message.recipients()]
+        if not emails:
+            return 0
+        OutgoingEmail.objects.bulk_create(emails)
+        enqueue_on_commit(send_outbox, dedup_key=OUTBOX_TASK_KEY)
+        return len(emails)
+
+
+def claim_batch(size):
+    """Пометить своей меткой до size писем, которые пора отправить."""
+    now = timezone.now()
+    free = Q(claim='') | Q(
+        claimed_at__lt=now - timedelta(seconds=settings.TASK_LOCK_TIMEOUT))
+    due = OutgoingEmail.objects.filter(
+        free,
+        next_attempt__lte=now,
+        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+    ).values_list('pk', flat=True)
+    claim = uuid.uuid4().hex
+    # Одним UPDATE: письмо, которое успел взять другой воркер, уже не
+    # подходит под free и не перезапишется.
+    OutgoingEmail.objects.filter(free, pk__in=list(due[:size])).update(
+        claim=claim, claimed_at=now)
+    return list(OutgoingEmail.objects.filter(claim=claim))
+
+
+def send_outbox():
+    """Отправить накопившиеся письма; вернуть (отправлено, с ошибкой)."""
+    sent = failed = 0
+    with get_connection(settings.OUTBOX_EMAIL_BACKEND) as connection:
+        while True:
+            batch = claim_batch(settings.OUTBOX_BATCH_SIZE)
+            if not batch:
+                break
+            delivered = []
+            for email in batch:
+                try:
+                    connection.send_messages([to_message(email, connection)])
+                except Exception:
+                    logger.exception('Письмо %s не отправлено', email.pk)
+                    OutgoingEmail.objects.filter(pk=email.pk).update(
+                        claim='',
+                        attempts=email.attempts + 1,
+                        next_attempt=(timezone.now()
+                                      + retry_delay(email.attempts + 1)),
+                        last_error=traceback.format_exc(),
+                    )
+                    failed += 1
+                else:
+                    delivered.append(email.pk)
+            OutgoingEmail.objects.filter(pk__in=delivered).delete()
+            sent += len(delivered)
+    schedule_retry()
+    return sent, failed
+
+
+def schedule_retry():
+    """Поставить send_outbox на время ближайшей повторной попытки."""
+    # Письма, взятые другой отправкой, — её забота.
+    next_attempt = OutgoingEmail.objects.filter(
+        claim='',
+        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+    ).aggregate(next_attempt=Min('next_attempt'))['next_attempt']
+    if next_attempt is None:
+        return
+    delay = max((next_attempt - timezone.now()).total_seconds(), 0)
+    enqueue(send_outbox, dedup_key=OUTBOX_TASK_KEY, delay=delay)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.sessions import SessionStore
+
+
+class Command(BaseCommand):
+    help = ('Удаляет истёкшие сессии небольшими порциями, не блокируя '
+            'таблицу сессий надолго')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk', type=int,
+                            default=settings.SESSION_CLEANUP_CHUNK,
+                            help='Сколько сессий удалять за один DELETE')
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help='Пауза между порциями, с')
+
+    def handle(self, *args, **options):
+        deleted = SessionStore.clear_expired(chunk_size=options['chunk'],
+                                             pause=options['pause'])
+        self.stdout.write(f'Удалено сессий: {deleted}')
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = ('Выдаёт подписанный токен для заголовка X-Profile или '
+            'параметра ?_profile=')
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
+        self.stderr.write(
+            f'Действует {settings.PROFILING_TOKEN_MAX_AGE} с')
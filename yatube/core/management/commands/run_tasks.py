@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.tasks import claim_tasks, execute_task, finish_task, run_in_thread
+
+
+class Command(BaseCommand):
+    help = ('Воркер очереди задач: выполняет задачи пулом потоков; '
+            'с --once — только то, что готово сейчас')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int,
+                            default=settings.TASK_WORKER_THREADS,
+                            help='Сколько задач выполнять одновременно; '
+                                 '0 — всё в основном потоке')
+        parser.add_argument('--once', action='store_true',
+                            help='Выйти, когда готовых задач не останется')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Пауза, когда задач нет, с')
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        pool = None
+        if threads:
+            pool = ThreadPoolExecutor(max_workers=threads,
+                                      thread_name_prefix='tasks')
+        done = failed = 0
+        try:
+            while True:
+                tasks = claim_tasks(max(threads, 1) * 2)
+                if pool is None:
+                    errors = [execute_task(task) for task in tasks]
+                else:
+                    errors = list(pool.map(
+                        partial(run_in_thread, execute_task), tasks))
+                # Учёт — в основном потоке, одним соединением.
+                results = [finish_task(task, error)
+                           for task, error in zip(tasks, errors)]
+                done += results.count(True)
+                failed += results.count(False)
+                if tasks:
+                    continue
+                if options['once']:
+                    break
+                # Долгоживущий процесс: не держим соединение вечно.
+                close_old_connections()
+                time.sleep(options['interval'])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        self.stdout.write(f'Выполнено: {done}, с ошибкой: {failed}')
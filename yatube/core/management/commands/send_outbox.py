@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.mail import send_outbox
+
+
+class Command(BaseCommand):
+    help = ('Отправляет накопившиеся письма сразу, не дожидаясь воркера '
+            'очереди задач')
+
+    def handle(self, *args, **options):
+        sent, failed = send_outbox()
+        self.stdout.write(f'Отправлено: {sent}, с ошибкой: {failed}')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.replica import replica_alias, sync_replica
+
+
+class Command(BaseCommand):
+    help = ('Копирует основную SQLite-базу в реплику (YATUBE_REPLICA_DB); '
+            'запускать по расписанию')
+
+    def handle(self, *args, **options):
+        if replica_alias() is None:
+            raise CommandError('Реплика не настроена: задайте '
+                               'YATUBE_REPLICA_DB')
+        sync_replica()
+        self.stdout.write(self.style.SUCCESS('Реплика обновлена'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from core.template_warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны и печатает время компиляции каждого'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=0,
+                            help='Показать только N самых медленных')
+
+    def handle(self, *args, **options):
+        report = warm_templates()
+        rows = sorted(report, key=lambda row: row[1], reverse=True)
+        if options['top']:
+            rows = rows[:options['top']]
+        for name, duration, error in rows:
+            line = f'{duration:8.1f} ms  {name}'
+            if error:
+                self.stderr.write(f'{line}  ОШИБКА: {error}')
+            else:
+                self.stdout.write(line)
+        total = sum(duration for _, duration, _ in report)
+        self.stdout.write(self.style.SUCCESS(
+            f'Шаблонов: {len(report)}, всего {total:.0f} ms'))
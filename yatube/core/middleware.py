@@ -0,0 +1,154 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .cache import get_tag_versions, page_cache_key
+from .profiling import RequestProfile, should_profile
+from .queries import QueryBudgetExceeded, budget_violations, record_queries
+from .replica import PIN_COOKIE, begin_request, wrote_to_primary
+
+
+class AnonymousPageCacheMiddleware:
+    """Отдаёт анонимам готовые страницы, помеченные через tag_page().
+
+    Вместе со страницей хранятся версии её тегов; запись считается
+    устаревшей, как только версия хотя бы одного тега поменялась.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.is_cacheable_request(request):
+            return self.get_response(request)
+
+        key = page_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            versions, response = entry
+            if get_tag_versions(versions) == versions:
+                response['X-Page-Cache'] = 'hit'
+                return get_conditional_response(
+                    request,
+                    etag=response.get('ETag'),
+                    last_modified=parse_http_date_safe(
+                        response.get('Last-Modified', '')),
+                    response=response,
+                )
+
+        response = self.get_response(request)
+        versions = getattr(request, 'page_cache_versions', None)
+        if versions is not None and self.is_cacheable_response(response):
+            cache.set(key, (versions, response), request.page_cache_timeout)
+            response['X-Page-Cache'] = 'miss'
+        return response
+
+    @staticmethod
+    def is_cacheable_request(request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+            and 'messages' not in request.COOKIES
+        )
+
+    @staticmethod
+    def is_cacheable_response(response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and 'private' not in response.get('Cache-Control', '')
+            and 'no-store' not in response.get('Cache-Control', '')
+        )
+
+
+class ReplicaPinMiddleware:
+    """Закрепляет за основной базой того, кто только что в неё писал.
+
+    Стоит снаружи SessionMiddleware, чтобы увидеть и запись сессии.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        begin_request(pinned=PIN_COOKIE in request.COOKIES)
+        response = self.get_response(request)
+        if wrote_to_primary():
+            response.set_cookie(PIN_COOKIE, '1',
+                                max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True, samesite='Lax')
+        return response
+
+
+logger = logging.getLogger('yatube.queries')
+
+
+class QueryInstrumentationMiddleware:
+    """Считает SQL-запросы, их время и повторы для каждого запроса.
+
+    Итог уходит в заголовок Server-Timing и в лог yatube.queries одной
+    JSON-строкой с view_name. Превышение QUERY_BUDGETS или повторы
+    одного запроса QUERY_DUPLICATE_LIMIT раз пишутся как warning, а при
+    QUERY_BUDGET_STRICT — роняют запрос (так тесты в CI видят N+1).
+    Запросы при отдаче потокового ответа сюда не попадают.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        response['Server-Timing'] = (
+            f'db;dur={recorder.duration_ms:.1f};'
+            f'desc="{recorder.count} queries"'
+        )
+        violations = budget_violations(view_name, recorder)
+        self.log(request, view_name, recorder, violations)
+        if violations and settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(
+                f'{view_name}: ' + '; '.join(violations))
+        return response
+
+    @staticmethod
+    def log(request, view_name, recorder, violations):
+        level = logging.WARNING if violations else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            'view_name': view_name,
+            'method': request.method,
+            'path': request.path,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration_ms, 2),
+            'duplicates': len(recorder.duplicates()),
+            'violations': violations,
+        }, ensure_ascii=False))
+
+
+class ProfilingMiddleware:
+    """Профилирует запрос по подписанному токену или выборочно.
+
+    Имя сохранённого профиля уходит в заголовок X-Profile-Id.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request):
+            return self.get_response(request)
+        with RequestProfile() as profile:
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        response['X-Profile-Id'] = profile.save(
+            request, view_name, response.status_code)
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 2.2.16 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.TextField(verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('from_email', models.CharField(max_length=254, verbose_name='От кого')),
+                ('recipients', models.TextField(help_text='JSON: to, cc, bcc, reply_to', verbose_name='Адресаты')),
+                ('headers', models.TextField(default='{}', verbose_name='Заголовки')),
+                ('alternatives', models.TextField(default='[]', help_text='JSON: [[содержимое, mimetype], ...]', verbose_name='Альтернативные версии')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('next_attempt', models.DateTimeField(verbose_name='Следующая попытка')),
+                ('claim', models.CharField(blank=True, help_text='Какой отправкой взято письмо', max_length=32, verbose_name='Метка воркера')),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(fields=['next_attempt'], name='outgoing_email_due_idx'),
+        ),
+    ]
@@ -0,0 +1,115 @@
+from django.db import models
+from django.db.models import Q
+
+
+class Task(models.Model):
+    """Отложенный вызов функции для воркера manage.py run_tasks."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=200,
+        verbose_name='Функция',
+        help_text='Путь для импорта, например posts.tasks.notify',
+    )
+    arguments = models.TextField(
+        default='{}',
+        verbose_name='Аргументы',
+        help_text='JSON: {"args": [...], "kwargs": {...}}',
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Состояние',
+    )
+    dedup_key = models.CharField(
+        max_length=200,
+        blank=True,
+        null=True,
+        verbose_name='Ключ дедупликации',
+        help_text='Пока задача с этим ключом ждёт в очереди, '
+                  'такую же не добавляем',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток',
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3,
+        verbose_name='Всего попыток',
+    )
+    run_at = models.DateTimeField(verbose_name='Когда выполнить')
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Взята воркером',
+    )
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.name} [{self.status}]'
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_at'],
+                         name='task_due_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dedup_key'],
+                                    condition=Q(status='pending'),
+                                    name='task_pending_dedup_uniq'),
+        ]
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+
+
+class OutgoingEmail(models.Model):
+    """Письмо, которое ещё не отправлено (core.mail)."""
+    subject = models.TextField(verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.CharField(max_length=254, verbose_name='От кого')
+    recipients = models.TextField(
+        verbose_name='Адресаты',
+        help_text='JSON: to, cc, bcc, reply_to',
+    )
+    headers = models.TextField(default='{}', verbose_name='Заголовки')
+    alternatives = models.TextField(
+        default='[]',
+        verbose_name='Альтернативные версии',
+        help_text='JSON: [[содержимое, mimetype], ...]',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток',
+    )
+    next_attempt = models.DateTimeField(verbose_name='Следующая попытка')
+    claim = models.CharField(
+        max_length=32,
+        blank=True,
+        verbose_name='Метка воркера',
+        help_text='Какой отправкой взято письмо',
+    )
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.subject
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['next_attempt'],
+                         name='outgoing_email_due_idx'),
+        ]
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
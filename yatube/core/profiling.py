@@ -0,0 +1,176 @@
+"""Профилирование отдельных запросов в продакшене.
+
+Запрос профилируется, если в заголовке X-Profile или в параметре
+?_profile= пришёл подписанный токен (manage.py profiling_token) или
+если он попал в долю PROFILING_SAMPLE_RATE. Для такого запроса
+сохраняются cProfile-дамп и текстовый отчёт с самыми тяжёлыми
+функциями и выделениями памяти (tracemalloc) в PROFILING_DIR/<view>/.
+"""
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.core import signing
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+TOKEN_SALT = 'yatube.profiling'
+TOKEN_VALUE = 'profile'
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 20
+
+
+def make_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(TOKEN_VALUE)
+
+
+def is_valid_token(token):
+    try:
+        value = signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return value == TOKEN_VALUE
+
+
+def should_profile(request):
+    token = (request.META.get(PROFILE_HEADER)
+             or request.GET.get(PROFILE_PARAM))
+    if token:
+        return is_valid_token(token)
+    rate = settings.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def profiles_dir():
+    return settings.PROFILING_DIR
+
+
+def view_dir_name(view_name):
+    # posts:profile -> posts.profile; всё лишнее из пути убираем.
+    return re.sub(r'[^\w.-]', '.', view_name or 'unresolved')
+
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+
+def start_tracing():
+    """Включить tracemalloc для ещё одного запроса.
+
+    tracemalloc один на процесс, а профилируемые запросы в разных
+    потоках могут перекрываться: считаем их и выключаем трассировку
+    только после последнего, и только если включали её сами.
+    """
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+
+
+def stop_tracing():
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+class RequestProfile:
+    """cProfile и tracemalloc на время одного запроса.
+
+    Пик памяти — общий для процесса: при перекрывающихся запросах он
+    включает и чужие выделения.
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def __enter__(self):
+        start_tracing()
+        # reset_peak() появился только в Python 3.9.
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self.before = tracemalloc.take_snapshot()
+        self.started = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.disable()
+        self.duration = time.perf_counter() - self.started
+        self.after = tracemalloc.take_snapshot()
+        self.peak = tracemalloc.get_traced_memory()[1]
+        stop_tracing()
+
+    def report(self, request, view_name, status):
+        out = io.StringIO()
+        out.write(f'{request.method} {request.get_full_path()}\n'
+                  f'view: {view_name}\nstatus: {status}\n'
+                  f'time: {self.duration * 1000:.1f} ms\n'
+                  f'peak memory: {self.peak / 1024:.0f} KiB\n\n')
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        out.write('\nАллокации за запрос:\n')
+        for stat in self.after.compare_to(
+                self.before, 'lineno')[:TOP_ALLOCATIONS]:
+            out.write(f'{stat}\n')
+        return out.getvalue()
+
+    def save(self, request, view_name, status):
+        """Записать дамп и отчёт; вернуть базовое имя файлов."""
+        directory = os.path.join(profiles_dir(), view_dir_name(view_name))
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.profiler.dump_stats(os.path.join(directory, f'{name}.prof'))
+        with open(os.path.join(directory, f'{name}.txt'), 'w',
+                  encoding='utf-8') as report:
+            report.write(self.report(request, view_name, status))
+        return name
+
+
+def list_profiles():
+    """Список сохранённых профилей, свежие первыми."""
+    root = profiles_dir()
+    if not os.path.isdir(root):
+        return []
+    profiles = []
+    for view in sorted(os.listdir(root)):
+        directory = os.path.join(root, view)
+        if not os.path.isdir(directory):
+            continue
+        for filename in os.listdir(directory):
+            if not filename.endswith('.txt'):
+                continue
+            path = os.path.join(directory, filename)
+            profiles.append({
+                'view': view,
+                'name': filename[:-len('.txt')],
+                'created': os.path.getmtime(path),
+            })
+    profiles.sort(key=lambda profile: profile['created'], reverse=True)
+    return profiles
+
+
+def profile_path(view, name, extension):
+    """Путь к файлу профиля или None, если имя не из нашего каталога."""
+    if extension not in ('prof', 'txt'):
+        return None
+    if not re.fullmatch(r'[\w-]+(\.[\w-]+)*', view):
+        return None
+    if not re.fullmatch(r'[\w-]+', name):
+        return None
+    path = os.path.join(profiles_dir(), view, f'{name}.{extension}')
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,63 @@
+"""Учёт SQL-запросов одного HTTP-запроса.
+
+Работает через execute_wrapper, поэтому не зависит от DEBUG и не
+хранит тексты запросов: отпечаток запроса — его SQL с плейсхолдерами,
+без параметров. Один отпечаток много раз за запрос — типичный N+1.
+"""
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+class QueryBudgetExceeded(AssertionError):
+    """View сделала больше запросов, чем ей положено."""
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[sql] += 1
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def duplicates(self, threshold=2):
+        """Отпечатки, повторившиеся не меньше threshold раз."""
+        return {sql: count for sql, count in self.fingerprints.items()
+                if count >= threshold}
+
+
+@contextmanager
+def record_queries():
+    """Считать запросы ко всем базам внутри блока."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def budget_violations(view_name, recorder):
+    """Список нарушений бюджета запросов для view_name."""
+    violations = []
+    budget = settings.QUERY_BUDGETS.get(view_name)
+    if budget is not None and recorder.count > budget:
+        violations.append(f'{recorder.count} запросов при бюджете {budget}')
+    limit = settings.QUERY_DUPLICATE_LIMIT
+    for sql, count in recorder.duplicates(limit).items():
+        violations.append(f'{count} одинаковых запросов: {sql[:200]}')
+    return violations
@@ -0,0 +1,152 @@
+"""Чтение с реплики для view, которые ничего не пишут.
+
+Реплика включается, только если в DATABASES есть алиас
+settings.REPLICA_DATABASE. Пользователь, который только что что-то
+записал, ещё REPLICA_PIN_SECONDS секунд читает с основной базы —
+так он сразу видит свой пост, даже если реплика отстаёт.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .cache import bump_tag_versions, get_tag_versions
+
+PIN_COOKIE = 'primary_pin'
+# Версия тега меняется при каждой синхронизации реплики: всё, что
+# прочитано с реплики, зависит и от него.
+REPLICA_TAG = 'replica-sync'
+
+_state = threading.local()
+
+
+def replica_alias():
+    alias = getattr(settings, 'REPLICA_DATABASE', None)
+    return alias if alias in connections.databases else None
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False)
+
+
+def read_alias():
+    """Алиас базы, с которой сейчас читает view."""
+    return getattr(_state, 'read_alias', None) or DEFAULT_DB_ALIAS
+
+
+def read_tags():
+    """Теги, которые добавляются к тегам страницы при чтении с реплики.
+
+    Версии тегов меняются при записи сразу, а данные на реплике — только
+    после синхронизации, поэтому без этого тега ETag и кеш страницы
+    остались бы от отстающей копии.
+    """
+    if getattr(_state, 'read_alias', None) is None:
+        return []
+    return [REPLICA_TAG]
+
+
+def read_generation():
+    """Алиас базы и, для реплики, версия её последней синхронизации."""
+    alias = read_alias()
+    tags = read_tags()
+    if not tags:
+        return alias
+    return f'{alias}@{get_tag_versions(tags)[REPLICA_TAG]}'
+
+
+def begin_request(pinned):
+    _state.pinned = pinned
+    _state.wrote = False
+    _state.read_alias = None
+
+
+def wrote_to_primary():
+    return getattr(_state, 'wrote', False)
+
+
+@contextmanager
+def reading_from(alias):
+    previous = getattr(_state, 'read_alias', None)
+    _state.read_alias = alias
+    _state.replica_used = False
+    try:
+        yield
+    finally:
+        _state.read_alias = previous
+
+
+def replica_cache_timeout(timeout):
+    """Срок кеша для того, что сейчас прочитано с реплики.
+
+    Версии тегов уже новые, а данные могли ещё не доехать, поэтому
+    такое кешируем не дольше допустимого отставания.
+    """
+    if getattr(_state, 'read_alias', None) is None:
+        return timeout
+    if not getattr(_state, 'replica_used', False):
+        return timeout
+    if timeout is None or timeout > settings.REPLICA_PIN_SECONDS:
+        return settings.REPLICA_PIN_SECONDS
+    return timeout
+
+
+def replica_reads(view_func):
+    """Выполнить view, читая с реплики, если пользователь не закреплён
+    за основной базой."""
+    @wraps(view_func)
+    def inner(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None or is_pinned():
+            return view_func(request, *args, **kwargs)
+        with reading_from(alias):
+            synced = get_tag_versions(read_tags())
+            response = view_func(request, *args, **kwargs)
+            if hasattr(request, 'page_cache_timeout'):
+                request.page_cache_versions.update(synced)
+                request.page_cache_timeout = replica_cache_timeout(
+                    request.page_cache_timeout)
+        return response
+    return inner
+
+
+class ReplicaRouter:
+    """Пишет всегда в default, читает оттуда, куда указал replica_reads."""
+
+    def db_for_read(self, model, **hints):
+        alias = getattr(_state, 'read_alias', None)
+        if alias is not None:
+            _state.replica_used = True
+        return alias
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # На реплике те же таблицы, что и в default.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
+
+
+def sync_replica(alias=None):
+    """Скопировать default в SQLite-реплику через backup API."""
+    alias = alias or replica_alias()
+    if alias is None:
+        raise ValueError('Реплика не настроена')
+    primary = connections[DEFAULT_DB_ALIAS]
+    primary.ensure_connection()
+    target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+    try:
+        primary.connection.backup(target)
+    finally:
+        target.close()
+    connections[alias].close()
+    bump_tag_versions(REPLICA_TAG)
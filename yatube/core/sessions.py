@@ -0,0 +1,91 @@
+"""Сессии: чтение через кеш, запись в базу только по делу.
+
+SESSION_ENGINE = 'core.sessions'. Как cached_db, но в кеше лежат
+закодированные данные вместе со сроком жизни, поэтому при сохранении
+видно, изменилось ли что-то. Строка в django_session обновляется, только
+если изменились данные или до конца сессии осталось меньше
+SESSION_EXPIRY_REFRESH секунд; тогда сессия продлевается на полный
+SESSION_COOKIE_AGE. Кеш обязан быть общим для всех процессов: сессия,
+закрытая в одном из них, должна пропасть из кеша и для остальных.
+Кеш в памяти процесса не пропускает проверка core.checks.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore)
+from django.utils import timezone
+
+KEY_PREFIX = 'yatube.sessions.'
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        # (закодированные данные, срок) в том виде, в каком они в базе.
+        self._stored = None
+
+    def expires_soon(self, expire_date):
+        left = expire_date - timezone.now()
+        return left < timedelta(seconds=settings.SESSION_EXPIRY_REFRESH)
+
+    def load(self):
+        try:
+            stored = self._cache.get(self.cache_key)
+        except Exception:
+            # Как в cached_db: memcached не принимает некоторые ключи.
+            stored = None
+        if stored is None:
+            session = self._get_session_from_db()
+            if session is None:
+                return {}
+            stored = (session.session_data, session.expire_date)
+            self._cache.set(self.cache_key, stored,
+                            self.get_expiry_age(expiry=stored[1]))
+        encoded, expire_date = stored
+        if expire_date <= timezone.now():
+            self._session_key = None
+            return {}
+        self._stored = stored
+        if self.expires_soon(expire_date):
+            # Пусть SessionMiddleware сохранит сессию и продлит её.
+            self.modified = True
+        return self.decode(encoded)
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        encoded = self.encode(self._get_session(no_load=must_create))
+        if (not must_create and self._stored is not None
+                and self._stored[0] == encoded
+                and not self.expires_soon(self._stored[1])):
+            return
+        # Сразу в базу (super() у cached_db), кеш — ниже в своём формате.
+        super(CachedDBStore, self).save(must_create)
+        self._stored = (encoded, self.get_expiry_date())
+        self._cache.set(self.cache_key, self._stored, self.get_expiry_age())
+
+    @classmethod
+    def clear_expired(cls, chunk_size=None, pause=0):
+        """Удалить истёкшие сессии порциями по chunk_size строк.
+
+        Каждая порция — отдельный короткий DELETE, поэтому запись в
+        таблицу сессий не ждёт, пока удалится весь хвост. Вернёт число
+        удалённых сессий.
+        """
+        chunk_size = chunk_size or settings.SESSION_CLEANUP_CHUNK
+        model = cls.get_model_class()
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(model.objects.filter(
+                expire_date__lt=now).values_list(
+                    'session_key', flat=True)[:chunk_size])
+            if not keys:
+                return deleted
+            deleted += model.objects.filter(session_key__in=keys).delete()[0]
+            if pause:
+                time.sleep(pause)
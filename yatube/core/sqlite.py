@@ -0,0 +1,52 @@
+"""Настройка каждого нового соединения с SQLite через PRAGMA.
+
+Значения берутся из settings.SQLITE_PRAGMAS; пустой словарь оставляет
+настройки SQLite по умолчанию.
+"""
+from django.conf import settings
+
+# Что можно задать и в каком порядке: journal_mode меняет файл базы,
+# поэтому идёт первым.
+PRAGMAS = (
+    'journal_mode',
+    'synchronous',
+    'busy_timeout',
+    'cache_size',
+    'mmap_size',
+    'temp_store',
+)
+
+
+def pragma_statements(pragmas):
+    unknown = set(pragmas) - set(PRAGMAS)
+    if unknown:
+        raise ValueError(f'Неизвестные PRAGMA: {", ".join(sorted(unknown))}')
+    for name in PRAGMAS:
+        if name not in pragmas:
+            continue
+        value = pragmas[name]
+        if not isinstance(value, int) and not str(value).isidentifier():
+            raise ValueError(f'Недопустимое значение PRAGMA {name}: {value!r}')
+        yield f'PRAGMA {name} = {value}'
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    # Напрямую через sqlite3: это настройка соединения, а не запросы
+    # view, им незачем попадать в учёт запросов.
+    for statement in pragma_statements(pragmas):
+        connection.connection.execute(statement)
+
+
+def current_pragmas(connection):
+    """Фактические значения PRAGMA у соединения — для проверок и замеров."""
+    values = {}
+    with connection.cursor() as cursor:
+        for name in PRAGMAS:
+            cursor.execute(f'PRAGMA {name}')
+            # У базы в памяти часть PRAGMA не возвращает строк.
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
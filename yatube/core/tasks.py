@@ -0,0 +1,138 @@
+"""Очередь задач в базе для работы, которая не должна задерживать ответ.
+
+View или сигнал ставит вызов функции в очередь (enqueue_on_commit —
+только после коммита записи, иначе воркер может не увидеть её данных),
+воркер manage.py run_tasks выполняет задачи пулом потоков. Задачу
+берёт атомарный UPDATE, поэтому воркеров может быть несколько.
+Выполненная задача удаляется, упавшая повторяется с удваивающейся
+паузой, исчерпавшая попытки остаётся со статусом failed.
+"""
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger('yatube.tasks')
+
+
+def task_name(func):
+    if isinstance(func, str):
+        return func
+    name = f'{func.__module__}.{func.__qualname__}'
+    if '<' in name:
+        raise ValueError(f'{name}: в очередь можно ставить только функции '
+                         'уровня модуля')
+    return name
+
+
+def enqueue(func, *args, dedup_key=None, delay=0, max_attempts=None,
+            **kwargs):
+    """Поставить func(*args, **kwargs) в очередь.
+
+    Аргументы должны сериализоваться в JSON. Вернёт None, если задача
+    с тем же dedup_key уже ждёт в очереди.
+    """
+    task = Task(
+        name=task_name(func),
+        arguments=json.dumps({'args': args, 'kwargs': kwargs}),
+        dedup_key=dedup_key,
+        max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    try:
+        with transaction.atomic():
+            task.save()
+    except IntegrityError:
+        return None
+    return task
+
+
+def enqueue_on_commit(func, *args, **kwargs):
+    """enqueue после коммита текущей транзакции; при откате — ничего."""
+    name = task_name(func)
+    transaction.on_commit(lambda: enqueue(name, *args, **kwargs))
+
+
+def retry_delay(attempts):
+    delay = settings.TASK_RETRY_BACKOFF * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.TASK_RETRY_BACKOFF_MAX))
+
+
+def requeue(task_id, **fields):
+    """Вернуть задачу в очередь; если там уже ждёт такая же — удалить."""
+    try:
+        with transaction.atomic():
+            Task.objects.filter(pk=task_id).update(
+                status=Task.PENDING, locked_at=None, **fields)
+    except IntegrityError:
+        Task.objects.filter(pk=task_id).delete()
+
+
+def requeue_stale(now):
+    """Задачи упавших воркеров снова в очередь."""
+    stale = Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=now - timedelta(seconds=settings.TASK_LOCK_TIMEOUT),
+    ).values_list('pk', flat=True)
+    for task_id in stale:
+        requeue(task_id)
+
+
+def claim_tasks(limit):
+    """Забрать до limit готовых к выполнению задач."""
+    now = timezone.now()
+    requeue_stale(now)
+    due = Task.objects.filter(
+        status=Task.PENDING, run_at__lte=now).values_list('pk', flat=True)
+    claimed = [
+        task_id for task_id in due[:limit]
+        # Задачу мог забрать другой воркер, пока мы читали список.
+        if Task.objects.filter(pk=task_id, status=Task.PENDING).update(
+            status=Task.RUNNING, locked_at=now, attempts=F('attempts') + 1)
+    ]
+    return list(Task.objects.filter(pk__in=claimed))
+
+
+def execute_task(task):
+    """Вызвать функцию задачи; вернуть текст ошибки или None."""
+    try:
+        func = import_string(task.name)
+        arguments = json.loads(task.arguments)
+        func(*arguments['args'], **arguments['kwargs'])
+    except Exception:
+        return traceback.format_exc()
+    return None
+
+
+def finish_task(task, error):
+    """Удалить выполненную задачу, упавшую отложить; True, если прошла."""
+    if error is None:
+        Task.objects.filter(pk=task.pk).delete()
+        return True
+    if task.attempts < task.max_attempts:
+        logger.warning('Задача %s упала (попытка %s из %s)', task.name,
+                       task.attempts, task.max_attempts)
+        requeue(task.pk, last_error=error,
+                run_at=timezone.now() + retry_delay(task.attempts))
+    else:
+        logger.error('Задача %s не выполнена:\n%s', task.name, error)
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.FAILED, last_error=error)
+    return False
+
+
+def run_in_thread(func, *args):
+    """Вызвать func в потоке пула и закрыть соединения этого потока."""
+    try:
+        return func(*args)
+    finally:
+        # У каждого потока пула своё соединение с базой.
+        connections.close_all()
@@ -0,0 +1,63 @@
+"""Предварительная компиляция шаблонов в кеш cached.Loader.
+
+Вызывается из wsgi.py до того, как воркер начнёт отвечать, и командой
+warm_templates, которая печатает отчёт о времени компиляции.
+"""
+import logging
+import os
+import time
+
+from django.template import TemplateSyntaxError, engines
+from django.template.utils import get_app_template_dirs
+
+TEMPLATE_SUFFIXES = ('.html', '.txt', '.xml')
+
+logger = logging.getLogger('yatube.templates')
+
+
+def template_names(engine):
+    """Имена всех шаблонов из DIRS движка и каталогов templates/ приложений."""
+    dirs = list(engine.dirs) + list(get_app_template_dirs('templates'))
+    names = []
+    seen = set()
+    for template_dir in dirs:
+        for root, _, files in os.walk(template_dir):
+            for filename in sorted(files):
+                if not filename.endswith(TEMPLATE_SUFFIXES):
+                    continue
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, template_dir).replace(
+                    os.sep, '/')
+                if name not in seen:
+                    seen.add(name)
+                    names.append(name)
+    return names
+
+
+def warm_templates():
+    """Скомпилировать все шаблоны всех Django-движков.
+
+    Возвращает список (имя, миллисекунды, ошибка или None).
+    """
+    report = []
+    for engine in engines.all():
+        for name in template_names(engine):
+            started = time.perf_counter()
+            error = None
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as exc:
+                error = str(exc)
+            report.append(
+                (name, (time.perf_counter() - started) * 1000, error))
+    return report
+
+
+def log_report(report):
+    total = sum(duration for _, duration, _ in report)
+    for name, duration, error in report:
+        if error:
+            logger.warning('%s: %s', name, error)
+        else:
+            logger.debug('%s: %.1f ms', name, duration)
+    logger.info('Скомпилировано шаблонов: %d за %.0f ms', len(report), total)
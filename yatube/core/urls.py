@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('', views.profile_list, name='profile_list'),
+    path('<str:view>/<str:name>.<str:extension>', views.profile_download,
+         name='profile_download'),
+]
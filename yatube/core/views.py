@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+
+from .profiling import list_profiles, profile_path
+
+
+@staff_member_required
+def profile_list(request):
+    profiles = list_profiles()
+    for profile in profiles:
+        profile['created'] = datetime.fromtimestamp(profile['created'])
+    context = {
+        'title': 'Профили запросов',
+        'profiles': profiles,
+    }
+    return render(request, 'core/profiles.html', context)
+
+
+@staff_member_required
+def profile_download(request, view, name, extension):
+    path = profile_path(view, name, extension)
+    if path is None:
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True,
+                        filename=f'{view}-{name}.{extension}')
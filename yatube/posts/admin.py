@@ -1,11 +1,59 @@
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.forms.models import BaseModelFormSet
+from django.utils.functional import cached_property
 
 from .models import Post, Group
+from .paginators import EstimatedCountPaginator
+from .search import filter_matching
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """AutocompleteSelect, которому подписи выбранных значений передают
+    заранее, чтобы не делать по запросу на каждую строку списка."""
+    selected_labels = None
+
+    def optgroups(self, name, value, attr=None):
+        if self.selected_labels is None:
+            return super().optgroups(name, value, attr)
+        default = (None, [], 0)
+        if not self.is_required:
+            default[1].append(self.create_option(name, '', '', False, 0))
+        for option_value in value:
+            label = self.selected_labels.get(str(option_value))
+            if label is not None:
+                default[1].append(self.create_option(
+                    name, option_value, label, True, len(default[1])))
+        return [default]
+
+
+class PostChangelistFormSet(BaseModelFormSet):
+    preloaded_fields = ('group',)
+
+    @cached_property
+    def selected_labels(self):
+        # Связанные объекты уже пришли в list_select_related.
+        return {
+            field: {
+                str(getattr(post, f'{field}_id')): str(getattr(post, field))
+                for post in self.get_queryset()
+                if getattr(post, f'{field}_id') is not None
+            }
+            for field in self.preloaded_fields
+        }
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        for field in self.preloaded_fields:
+            widget = form.fields[field].widget
+            widget = getattr(widget, 'widget', widget)
+            widget.selected_labels = self.selected_labels[field]
+        return form
 
 
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
-    pass
+    search_fields = ('title', 'slug',)
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -14,6 +62,30 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     list_editable = ('text', 'group',)
     empty_value_display = '-пусто-'
+    # Дальше — чтобы список не замедлялся с ростом таблицы: связанные
+    # объекты одним JOIN, вместо <select> со всеми группами — автодополнение,
+    # без второго полного COUNT(*) и с оценкой числа строк.
+    list_select_related = ('author', 'group',)
+    autocomplete_fields = ('author', 'group',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs.setdefault('widget', PreloadedAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using')))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_formset(self, request, **kwargs):
+        kwargs.setdefault('formset', PostChangelistFormSet)
+        return super().get_changelist_formset(request, **kwargs)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Ищем через полнотекстовый индекс, а не LIKE '%...%'.
+        if not search_term:
+            return queryset, False
+        return filter_matching(queryset, search_term), False
 
 
 admin.site.register(Post, PostAdmin)
@@ -0,0 +1,157 @@
+"""JSON-API только для чтения поверх тех же лент, что и HTML-страницы.
+
+Строки берутся через values() без создания моделей, страницы — по
+курсору, а параметр ?fields=id,text оставляет в ответе только нужное.
+"""
+from functools import wraps
+
+from django.http import JsonResponse
+
+from core.cache import tag_page
+from core.replica import replica_reads
+
+from .cache import GLOBAL_FEED, author_feed, group_feed, post_tag
+from .conditions import (conditional_page, group_validators, index_validators,
+                         post_validators, profile_validators)
+from .models import Group, Post, User
+from .paginators import (CURSOR_NEXT, CURSOR_PARAM, CURSOR_PREVIOUS,
+                         CursorPaginator, make_cursor)
+
+# Имя поля в ответе -> путь для values().
+API_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated': 'updated',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+FIELDS_PARAM = 'fields'
+LIMIT_PARAM = 'limit'
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def json_response(data, status=200):
+    # Кириллица без \uXXXX заметно короче.
+    return JsonResponse(data, status=status,
+                        json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(view_func):
+    """Превратить ApiError в JSON-ответ с нужным статусом."""
+    @wraps(view_func)
+    def inner(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except ApiError as error:
+            return json_response({'detail': str(error)}, error.status)
+    return inner
+
+
+def get_fields(request):
+    raw = request.GET.get(FIELDS_PARAM)
+    if not raw:
+        return list(API_FIELDS)
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown:
+        raise ApiError(f"Неизвестные поля: {', '.join(unknown)}")
+    return fields
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get(LIMIT_PARAM, DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError(f'{LIMIT_PARAM} должен быть числом')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def serialize(rows, fields):
+    return [{name: row[API_FIELDS[name]] for name in fields} for row in rows]
+
+
+def page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query[CURSOR_PARAM] = cursor
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+def feed_response(request, queryset):
+    fields = get_fields(request)
+    # id и pub_date нужны курсору, даже если клиент их не просил.
+    paths = {API_FIELDS[name] for name in fields} | {'id', 'pub_date'}
+    paginator = CursorPaginator(queryset.values(*paths), get_limit(request))
+    page = paginator.get_cursor_page(request.GET.get(CURSOR_PARAM))
+    rows = page.object_list
+    next_cursor = previous_cursor = None
+    if page.has_next():
+        next_cursor = make_cursor(CURSOR_NEXT, rows[-1]['pub_date'],
+                                  rows[-1]['id'])
+    if page.has_previous():
+        previous_cursor = make_cursor(CURSOR_PREVIOUS, rows[0]['pub_date'],
+                                      rows[0]['id'])
+    return json_response({
+        'results': serialize(rows, fields),
+        'next': page_url(request, next_cursor),
+        'previous': page_url(request, previous_cursor),
+    })
+
+
+def get_pk_or_404(queryset, message, **lookup):
+    pk = queryset.filter(**lookup).values_list('pk', flat=True).first()
+    if pk is None:
+        raise ApiError(message, status=404)
+    return pk
+
+
+@replica_reads
+@conditional_page(index_validators)
+@api_view
+def posts(request):
+    tag_page(request, GLOBAL_FEED)
+    return feed_response(request, Post.objects.all())
+
+
+@replica_reads
+@conditional_page(group_validators)
+@api_view
+def group_posts(request, slug):
+    group_id = get_pk_or_404(Group.objects, 'Группа не найдена', slug=slug)
+    tag_page(request, group_feed(group_id))
+    return feed_response(request, Post.objects.filter(group_id=group_id))
+
+
+@replica_reads
+@conditional_page(profile_validators)
+@api_view
+def profile_posts(request, username):
+    author_id = get_pk_or_404(User.objects, 'Пользователь не найден',
+                              username=username)
+    tag_page(request, author_feed(author_id))
+    return feed_response(request, Post.objects.filter(author_id=author_id))
+
+
+@replica_reads
+@conditional_page(post_validators)
+@api_view
+def post_detail(request, post_id):
+    fields = get_fields(request)
+    paths = {API_FIELDS[name] for name in fields} | {'author_id', 'group_id'}
+    tag_page(request, post_tag(post_id))
+    row = Post.objects.filter(pk=post_id).values(*paths).first()
+    if row is None:
+        raise ApiError('Пост не найден', status=404)
+    tag_page(request, author_feed(row['author_id']))
+    if row['group_id'] is not None:
+        tag_page(request, group_feed(row['group_id']))
+    return json_response(serialize([row], fields)[0])
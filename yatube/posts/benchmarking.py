@@ -0,0 +1,133 @@
+"""Общие помощники для команд bench_*.
+
+Замеры идут на отдельной тестовой базе и с отдельным кешем, рабочие
+данные, кеш и сессии не трогаются.
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import (override_settings, setup_databases,
+                               teardown_databases)
+
+from .models import Group, Post, User
+
+WORDS = (
+    'толстой', 'война', 'мир', 'анна', 'каренина', 'революция', 'зеркало',
+    'роман', 'глава', 'письмо', 'поезд', 'бал', 'усадьба', 'охота', 'степь',
+    'дорога', 'зима', 'весна', 'сад', 'река', 'город', 'деревня', 'книга',
+    'python', 'django', 'sqlite', 'index', 'query', 'cache', 'page',
+)
+# Свой кеш в памяти процесса: его можно чистить перед каждым замером,
+# не задевая общий кеш сайта. Потоки одного процесса делят его между
+# собой по LOCATION.
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yatube-bench',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+
+@contextmanager
+def isolated_database(verbosity=0, name=None):
+    """Временная тестовая база и собственный кеш; name — путь к файлу
+    вместо базы в памяти (нужен, когда с базой работают несколько потоков).
+
+    override_settings(CACHES=...) на входе и выходе сбрасывает caches,
+    так что cache и сессии внутри блока смотрят только в BENCH_CACHES.
+    """
+    if name is not None:
+        connection.settings_dict['TEST']['NAME'] = name
+    with override_settings(CACHES=BENCH_CACHES):
+        old_config = setup_databases(verbosity=verbosity, interactive=False)
+        try:
+            yield
+        finally:
+            teardown_databases(old_config, verbosity=verbosity)
+            cache.clear()
+
+
+def seed_posts(count, authors=100, groups=20, batch_size=10000, seed=0):
+    """Быстро насыпать count постов от authors авторов в groups группах.
+
+    Сигналы не срабатывают (bulk_create), поэтому счётчики в конце
+    пересчитываются одним проходом.
+    """
+    from .counters import recount_posts
+
+    rnd = random.Random(seed)
+    users = User.objects.bulk_create(
+        User(username=f'bench_author_{i}') for i in range(authors))
+    if not users[0].pk:
+        users = list(User.objects.filter(username__startswith='bench_author_'))
+    Group.objects.bulk_create(
+        Group(title=f'Группа {i}', slug=f'bench-group-{i}',
+              description='Группа для замеров') for i in range(groups))
+    group_ids = list(Group.objects.filter(
+        slug__startswith='bench-group-').values_list('pk', flat=True))
+    user_ids = [user.pk for user in users]
+    # Редкие слова вида «метка123» встречаются примерно в десяти постах.
+    rare_words = max(1, count // 10)
+    for start in range(0, count, batch_size):
+        Post.objects.bulk_create(
+            Post(
+                text=' '.join(rnd.choices(WORDS, k=rnd.randint(5, 40)))
+                + f' метка{rnd.randrange(rare_words)}',
+                author_id=rnd.choice(user_ids),
+                group_id=rnd.choice(group_ids + [None]),
+            )
+            for _ in range(min(batch_size, count - start))
+        )
+    recount_posts()
+
+
+def measure(func, repeat, clock=time.perf_counter):
+    """Время вызовов func в миллисекундах: p50, p95, p99 и максимум.
+
+    clock=time.process_time меряет процессорное время вместо настенного.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = clock()
+        func()
+        timings.append((clock() - started) * 1000)
+    return percentiles(timings)
+
+
+def percentiles(timings):
+    """p50, p95, p99 и максимум для списка замеров."""
+    timings = sorted(timings)
+    return {
+        'p50': statistics.median(timings),
+        'p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'p99': timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        'max': timings[-1],
+    }
+
+
+def find_regressions(baseline, current, tolerance=0.2):
+    """Сравнить два отчёта bench_views и вернуть список регрессий.
+
+    Регрессия — p95 вырос больше чем на tolerance или стало больше
+    SQL-запросов. Замеры, которых нет в базовом отчёте, пропускаются.
+    """
+    regressions = []
+    for size, views in current['results'].items():
+        for name, result in views.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if before is None:
+                continue
+            if result['p95'] > before['p95'] * (1 + tolerance):
+                regressions.append(
+                    f"{size} {name}: p95 {before['p95']:.1f}ms -> "
+                    f"{result['p95']:.1f}ms")
+            if result['queries'] > before['queries']:
+                regressions.append(
+                    f"{size} {name}: запросов {before['queries']} -> "
+                    f"{result['queries']}")
+    return regressions
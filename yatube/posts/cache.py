@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import bump_tag_versions, get_tag_versions
+
+GLOBAL_FEED = 'global'
+FEED_FRAGMENT_KEY = 'posts:feed-fragment:{}:{}:{}'
+FEED_STATS_KEY = 'posts:feed-cache:{}'
+
+
+def group_feed(group_id):
+    return f'group:{group_id}'
+
+
+def author_feed(author_id):
+    return f'author:{author_id}'
+
+
+def post_tag(post_id):
+    return f'post:{post_id}'
+
+
+def feed_cache_timeout():
+    return getattr(settings, 'POSTS_FEED_CACHE_TIMEOUT', 60 * 5)
+
+
+def get_feed_version(feed):
+    return get_tag_versions([feed])[feed]
+
+
+def bump_feed_versions(*feeds):
+    bump_tag_versions(*feeds)
+
+
+def feed_fragment_key(feed, page_key):
+    return FEED_FRAGMENT_KEY.format(feed, get_feed_version(feed), page_key)
+
+
+def record_feed_cache(hit):
+    key = FEED_STATS_KEY.format('hits' if hit else 'misses')
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_feed_cache_stats():
+    stats = cache.get_many([FEED_STATS_KEY.format('hits'),
+                            FEED_STATS_KEY.format('misses')])
+    hits = stats.get(FEED_STATS_KEY.format('hits'), 0)
+    misses = stats.get(FEED_STATS_KEY.format('misses'), 0)
+    return {'hits': hits, 'misses': misses}
+
+
+def reset_feed_cache_stats():
+    cache.delete_many([FEED_STATS_KEY.format('hits'),
+                       FEED_STATS_KEY.format('misses')])
@@ -0,0 +1,90 @@
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.cache import get_tag_modified, get_tag_versions
+from core.replica import read_tags
+
+from .cache import GLOBAL_FEED, author_feed, group_feed, post_tag
+from .models import Group, Post, User
+
+
+def make_etag(request, tags):
+    """ETag из версий тегов страницы, пользователя и адреса.
+
+    Версии живут в кеше, поэтому ETag меняется и при удалении постов,
+    которое не видно по датам изменения.
+    """
+    versions = sorted(get_tag_versions(tags).items())
+    raw = f'{versions}|{request.user.pk}|{request.get_full_path()}'
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def index_validators(request):
+    return [GLOBAL_FEED]
+
+
+def group_validators(request, slug):
+    group_id = Group.objects.filter(slug=slug).values_list(
+        'pk', flat=True).first()
+    if group_id is None:
+        return None
+    return [group_feed(group_id)]
+
+
+def profile_validators(request, username):
+    author_id = User.objects.filter(username=username).values_list(
+        'pk', flat=True).first()
+    if author_id is None:
+        return None
+    return [author_feed(author_id)]
+
+
+def post_validators(request, post_id):
+    post = Post.objects.filter(pk=post_id).values_list(
+        'author_id', 'group_id').first()
+    if post is None:
+        return None
+    author_id, group_id = post
+    tags = [post_tag(post_id), author_feed(author_id)]
+    if group_id is not None:
+        tags.append(group_feed(group_id))
+    return tags
+
+
+def conditional_page(validators):
+    """Как django.views.decorators.http.condition, но ETag и
+    Last-Modified считаются по тегам страницы.
+
+    validators(request, *args, **kwargs) возвращает теги или None, если
+    объекта нет — тогда решает сама view. Last-Modified — время
+    последней смены версии любого из тегов, поэтому он меняется и при
+    удалении поста или правке группы и автора, а не только постов.
+    При чтении с реплики к тегам добавляется тег её синхронизации.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+            tags = validators(request, *args, **kwargs)
+            if tags is None:
+                return view_func(request, *args, **kwargs)
+            tags = [*tags, *read_tags()]
+            etag = quote_etag(make_etag(request, tags))
+            last_modified = int(get_tag_modified(tags))
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                # Перезаписываем, а не setdefault: Feed сам ставит
+                # Last-Modified по updated последнего поста, и после
+                # удаления свежего поста дата откатилась бы назад.
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+            return response
+        return inner
+    return decorator
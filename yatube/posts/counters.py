@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import AuthorCounter, Group, Post
+
+
+def change_author_count(user_id, delta):
+    """Сдвинуть счётчик автора на delta, создав его при необходимости."""
+    counters = AuthorCounter.objects.filter(user_id=user_id)
+    if delta < 0:
+        counters = counters.filter(posts_count__gte=-delta)
+    updated = counters.update(posts_count=F('posts_count') + delta)
+    if updated or delta <= 0:
+        return
+    _, created = AuthorCounter.objects.get_or_create(
+        user_id=user_id, defaults={'posts_count': delta})
+    if not created:
+        counters.update(posts_count=F('posts_count') + delta)
+
+
+def change_group_count(group_id, delta):
+    if group_id is None:
+        return
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(posts_count__gte=-delta)
+    groups.update(posts_count=F('posts_count') + delta)
+
+
+@transaction.atomic
+def recount_posts():
+    """Пересчитать счётчики с нуля. Возвращает число исправленных строк."""
+    fixed = 0
+    groups = Group.objects.annotate(actual=Count('posts')).exclude(
+        posts_count=F('actual'))
+    for group in groups:
+        Group.objects.filter(pk=group.pk).update(posts_count=group.actual)
+        fixed += 1
+
+    actual = dict(
+        Post.objects.order_by().values_list('author').annotate(Count('id'))
+    )
+    stored = dict(
+        AuthorCounter.objects.values_list('user_id', 'posts_count')
+    )
+    for user_id, count in stored.items():
+        if actual.get(user_id, 0) != count:
+            AuthorCounter.objects.filter(user_id=user_id).update(
+                posts_count=actual.get(user_id, 0))
+            fixed += 1
+    missing = [
+        AuthorCounter(user_id=user_id, posts_count=count)
+        for user_id, count in actual.items() if user_id not in stored
+    ]
+    AuthorCounter.objects.bulk_create(missing)
+    return fixed + len(missing)
@@ -0,0 +1,50 @@
+import csv
+import json
+
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'author__username', 'group__slug')
+EXPORT_HEADER = ('id', 'text', 'pub_date', 'author', 'group')
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+CHUNK_SIZE = 2000
+
+
+class Echo:
+    """Псевдофайл для csv.writer: write() просто возвращает строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    # values_list без моделей и iterator() без кеша результатов:
+    # в памяти одновременно не больше chunk_size строк.
+    return queryset.order_by('pk').values_list(*EXPORT_FIELDS).iterator(
+        chunk_size=chunk_size)
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for pk, text, pub_date, author, group in rows:
+        yield writer.writerow(
+            (pk, text, pub_date.isoformat(), author, group or ''))
+
+
+def jsonl_lines(rows):
+    for pk, text, pub_date, author, group in rows:
+        yield json.dumps({
+            'id': pk,
+            'text': text,
+            'pub_date': pub_date.isoformat(),
+            'author': author,
+            'group': group,
+        }, ensure_ascii=False) + '\n'
+
+
+def export_lines(queryset, fmt, chunk_size=CHUNK_SIZE):
+    rows = export_rows(queryset, chunk_size)
+    if fmt == 'csv':
+        return csv_lines(rows)
+    return jsonl_lines(rows)
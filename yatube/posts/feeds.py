@@ -0,0 +1,103 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.template.defaultfilters import truncatechars
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from core.cache import tag_page
+
+from .cache import GLOBAL_FEED, author_feed, group_feed
+from .models import Group, Post, User
+
+FEED_ITEMS = 20
+
+
+class LatestPostsFeed(Feed):
+    """Общая лента. Тело кешируется для анонимов кешем страниц
+    и сбрасывается вместе с HTML-лентой по тем же тегам."""
+    title = 'Yatube: последние записи'
+    description = 'Новые записи на Yatube'
+
+    def get_object(self, request):
+        tag_page(request, GLOBAL_FEED)
+
+    def link(self):
+        return reverse('posts:index')
+
+    def items(self):
+        return Post.objects.syndication()[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return truncatechars(item.text, 50)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', kwargs={'post_id': item.pk})
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated
+
+
+class GroupPostsFeed(LatestPostsFeed):
+    def get_object(self, request, slug):
+        group = get_object_or_404(Group, slug=slug)
+        tag_page(request, group_feed(group.pk))
+        return group
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return reverse('posts:group_list', kwargs={'slug': group.slug})
+
+    def items(self, group):
+        return Post.objects.syndication().filter(group=group)[:FEED_ITEMS]
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        author = get_object_or_404(User, username=username)
+        tag_page(request, author_feed(author.pk))
+        return author
+
+    def title(self, author):
+        return f'Yatube: записи {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Новые записи пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('posts:profile', kwargs={'username': author.username})
+
+    def items(self, author):
+        return Post.objects.syndication().filter(author=author)[:FEED_ITEMS]
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, group):
+        return self.description(group)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
@@ -6,7 +6,7 @@ class PostForm(forms.ModelForm):
 
     class Meta:
         model = Post
-        fields = ('text', 'group')
+        fields = ('text', 'group', 'image')
         verbose_name = 'Форма поста'
         verbose_name_plural = 'Формы постов'
         help_texts = {
@@ -0,0 +1,62 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+
+from posts.benchmarking import isolated_database, measure, seed_posts
+from posts.models import Group, Post, User
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает процессорное время на запрос у JSON-API '
+            'и HTML-страниц лент')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            self.stdout.write(f"Создаю {options['posts']} постов...")
+            seed_posts(options['posts'])
+            for name, html, api in self.pages():
+                for kind, address in (('html', html), ('api', api)):
+                    self.report(f'{name} {kind}', address, options['repeat'])
+
+    @staticmethod
+    def pages():
+        group = Group.objects.first()
+        author = User.objects.filter(username__startswith='bench_').first()
+        post = Post.objects.first()
+        yield ('index', reverse('posts:index'), reverse('posts:api_posts'))
+        yield ('group',
+               reverse('posts:group_list', kwargs={'slug': group.slug}),
+               reverse('posts:api_group_posts', kwargs={'slug': group.slug}))
+        yield ('profile',
+               reverse('posts:profile',
+                       kwargs={'username': author.username}),
+               reverse('posts:api_profile_posts',
+                       kwargs={'username': author.username}))
+        yield ('detail',
+               reverse('posts:post_detail', kwargs={'post_id': post.pk}),
+               reverse('posts:api_post_detail', kwargs={'post_id': post.pk}))
+
+    def report(self, name, address, repeat):
+        client = Client()
+        size = 0
+
+        def request():
+            nonlocal size
+            # Без кеша страниц: меряем саму выдачу, а не попадание в кеш.
+            # Кеш свой, из isolated_database(), общий он не задевает.
+            cache.clear()
+            size = len(client.get(address).content)
+
+        timings = measure(request, repeat, clock=time.process_time)
+        self.stdout.write(
+            f'{name:14} {size:7d}B '
+            + ' '.join(f'{key}={value:.1f}ms'
+                       for key, value in timings.items())
+        )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from posts.benchmarking import isolated_database, measure, seed_posts
+from posts.models import Post
+from posts.search import fts_available, search_posts
+
+TERMS = ('метка42', 'анна каренина', 'толстой')
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает поиск через FTS5 и через LIKE на тестовой базе'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with isolated_database():
+            if not fts_available():
+                self.stderr.write('FTS5 доступен только в SQLite')
+                return
+            self.stdout.write(f"Создаю {options['posts']} постов...")
+            seed_posts(options['posts'])
+            for term in TERMS:
+                self.report(term, options['repeat'])
+
+    def report(self, term, repeat):
+        # Как в view поиска и в админке: число результатов и первая страница.
+        def fts():
+            queryset = search_posts(Post.objects.feed(), term)
+            queryset.count()
+            list(queryset[:10])
+
+        def like():
+            queryset = Post.objects.feed()
+            for word in term.split():
+                queryset = queryset.filter(text__icontains=word)
+            queryset.count()
+            list(queryset[:10])
+
+        for name, func in (('fts5', fts), ('like', like)):
+            timings = measure(func, repeat)
+            self.stdout.write(
+                f'{term!r:24} {name:5} '
+                + ' '.join(f'{key}={value:.1f}ms'
+                           for key, value in timings.items())
+            )
@@ -0,0 +1,120 @@
+import os
+import random
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from posts.benchmarking import isolated_database, percentiles, seed_posts
+from posts.models import Group, Post, User
+
+# Как было до настройки: журнал отката и полный fsync, соединение
+# открывается на каждый запрос.
+BASELINE = ({'journal_mode': 'delete', 'synchronous': 'full'}, 0)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность views постов в несколько '
+            'потоков с настройками SQLite по умолчанию и из settings')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на поток')
+        parser.add_argument('--write-ratio', type=float, default=0.1)
+
+    def handle(self, *args, **options):
+        self.options = options
+        profiles = {
+            'default': BASELINE,
+            'tuned': (settings.SQLITE_PRAGMAS,
+                      settings.DATABASES['default'].get('CONN_MAX_AGE', 0)),
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            name = os.path.join(tmp_dir, 'bench.sqlite3')
+            with isolated_database(name=name):
+                self.stdout.write(f"Создаю {options['posts']} постов...")
+                seed_posts(options['posts'])
+                self.prepare()
+                for profile, (pragmas, max_age) in profiles.items():
+                    self.report(profile, pragmas, max_age)
+
+    def prepare(self):
+        self.author = User.objects.filter(
+            username__startswith='bench_author_').first()
+        self.read_addresses = [reverse('posts:index')]
+        self.read_addresses += [
+            reverse('posts:group_list', kwargs={'slug': slug})
+            for slug in Group.objects.values_list('slug', flat=True)[:5]]
+        self.read_addresses += [
+            reverse('posts:profile', kwargs={'username': username})
+            for username in User.objects.filter(
+                username__startswith='bench_author_'
+            ).values_list('username', flat=True)[:5]]
+        self.read_addresses += [
+            reverse('posts:post_detail', kwargs={'post_id': pk})
+            for pk in Post.objects.values_list('pk', flat=True)[:20]]
+
+    def report(self, profile, pragmas, max_age):
+        connections.close_all()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        results = {'read': [], 'write': [], 'errors': 0}
+        lock = threading.Lock()
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            threads = [
+                threading.Thread(target=self.worker,
+                                 args=(seed, results, lock))
+                for seed in range(self.options['threads'])
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        connections.close_all()
+        self.stdout.write(f'{profile}: {elapsed:.1f}s, '
+                          f"ошибок {results['errors']}")
+        for kind in ('read', 'write'):
+            timings = results[kind]
+            if not timings:
+                continue
+            self.stdout.write(
+                f'  {kind:5} {len(timings) / elapsed:8.1f} запросов/с '
+                + ' '.join(f'{key}={value:.1f}ms'
+                           for key, value in percentiles(timings).items())
+            )
+
+    def worker(self, seed, results, lock):
+        rnd = random.Random(seed)
+        client = Client()
+        client.force_login(self.author)
+        timings = {'read': [], 'write': []}
+        errors = 0
+        try:
+            for number in range(self.options['requests']):
+                is_write = rnd.random() < self.options['write_ratio']
+                started = time.perf_counter()
+                try:
+                    if is_write:
+                        client.post(reverse('posts:post_create'), data={
+                            'text': f'Пост из потока {seed}, №{number}'})
+                    else:
+                        client.get(rnd.choice(self.read_addresses))
+                except DatabaseError:
+                    errors += 1
+                    continue
+                kind = 'write' if is_write else 'read'
+                timings[kind].append((time.perf_counter() - started) * 1000)
+        finally:
+            connections.close_all()
+        with lock:
+            results['read'] += timings['read']
+            results['write'] += timings['write']
+            results['errors'] += errors
@@ -0,0 +1,170 @@
+import importlib
+import json
+import re
+import time
+import tracemalloc
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.benchmarking import (find_regressions, isolated_database,
+                                percentiles, seed_posts)
+from posts.models import Group, Post
+
+URL_MODULES = ('posts.urls', 'users.urls', 'about.urls')
+SIZES = (10000, 100000, 1000000)
+QUERY_PARAMS = {
+    'posts:search': {'q': 'толстой'},
+}
+# После этих адресов клиента нужно снова залогинить.
+RELOGIN = {'users:logout'}
+
+
+class Command(BaseCommand):
+    help = ('Меряет все адреса posts, users и about на базах из 10 тыс., '
+            '100 тыс. и 1 млн постов; умеет сравнивать с прошлым отчётом')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--only', help='Регулярка по имени адреса')
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Не чистить кеш перед каждым запросом')
+        parser.add_argument('--output', default='bench-views.json')
+        parser.add_argument('--compare', metavar='BASELINE',
+                            help='Отчёт, с которым сравнить результат')
+        parser.add_argument('--input', help='Не мерить, а взять готовый '
+                                            'отчёт (для --compare)')
+        parser.add_argument('--tolerance', type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        self.options = options
+        if options['input']:
+            report = self.load(options['input'])
+        else:
+            report = self.run()
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Отчёт записан в {options['output']}")
+        if options['compare']:
+            self.compare(self.load(options['compare']), report)
+
+    @staticmethod
+    def load(path):
+        try:
+            with open(path) as report:
+                return json.load(report)
+        except (OSError, ValueError) as error:
+            raise CommandError(f'{path}: {error}')
+
+    def run(self):
+        report = {
+            'meta': {
+                'repeat': self.options['repeat'],
+                'warm_cache': self.options['warm_cache'],
+                'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': {},
+        }
+        for size in self.options['sizes']:
+            with isolated_database():
+                self.stdout.write(f'Создаю {size} постов...')
+                seed_posts(size)
+                report['results'][str(size)] = self.run_size()
+        return report
+
+    def run_size(self):
+        self.post = Post.objects.select_related('author').first()
+        self.user = self.post.author
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        self.client = Client()
+        self.client.force_login(self.user)
+        results = {}
+        for name, address in self.addresses():
+            result = results[name] = self.measure(name, address)
+            self.stdout.write(
+                f"  {name:26} {result['status']} "
+                f"p50={result['p50']:.1f}ms p95={result['p95']:.1f}ms "
+                f"p99={result['p99']:.1f}ms queries={result['queries']} "
+                f"peak={result['peak_kib']}KiB"
+            )
+        return results
+
+    def url_kwargs(self):
+        group = Group.objects.order_by('-posts_count').first()
+        return {
+            'slug': group.slug,
+            'username': self.user.username,
+            'post_id': self.post.pk,
+            'pk': self.post.pk,
+            'fmt': 'csv',
+        }
+
+    def addresses(self):
+        """Имена и адреса всех именованных маршрутов из URL_MODULES."""
+        values = self.url_kwargs()
+        only = self.options['only']
+        for module_name in URL_MODULES:
+            module = importlib.import_module(module_name)
+            for pattern in module.urlpatterns:
+                name = f'{module.app_name}:{pattern.name}'
+                if only and not re.search(only, name):
+                    continue
+                kwargs = {key: values[key]
+                          for key in pattern.pattern.regex.groupindex}
+                yield name, reverse(name, kwargs=kwargs)
+
+    def request(self, name, address):
+        response = self.client.get(address, QUERY_PARAMS.get(name))
+        if response.streaming:
+            # Выгрузки отдаются потоком — меряем всю отдачу целиком.
+            b''.join(response.streaming_content)
+        return response
+
+    def prepare(self, name):
+        # Кеш здесь свой, из isolated_database(): общий кеш сайта и его
+        # сессии это не задевает.
+        if not self.options['warm_cache']:
+            cache.clear()
+        if name in RELOGIN:
+            self.client.force_login(self.user)
+
+    def measure(self, name, address):
+        timings = []
+        for _ in range(self.options['repeat']):
+            self.prepare(name)
+            started = time.perf_counter()
+            response = self.request(name, address)
+            timings.append((time.perf_counter() - started) * 1000)
+        # Запросы и память — отдельным проходом, чтобы tracemalloc
+        # не портил замер времени.
+        self.prepare(name)
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                self.request(name, address)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        if name in RELOGIN:
+            self.client.force_login(self.user)
+        return {
+            **percentiles(timings),
+            'status': response.status_code,
+            'queries': len(queries),
+            'peak_kib': round(peak / 1024),
+        }
+
+    def compare(self, baseline, report):
+        regressions = find_regressions(baseline, report,
+                                       self.options['tolerance'])
+        if regressions:
+            for line in regressions:
+                self.stderr.write(line)
+            raise CommandError(f'Регрессий: {len(regressions)}')
+        self.stdout.write(self.style.SUCCESS('Регрессий нет'))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.export import CHUNK_SIZE, EXPORT_FORMATS, export_lines
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает посты автора, группы или всего сайта'
+
+    def add_arguments(self, parser):
+        scope = parser.add_mutually_exclusive_group()
+        scope.add_argument('--author', help='username автора')
+        scope.add_argument('--group', help='slug группы')
+        parser.add_argument('--format', choices=tuple(EXPORT_FORMATS),
+                            default='jsonl')
+        parser.add_argument('--output', default='-',
+                            help="Файл или '-' для stdout")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.all()
+        if options['author']:
+            queryset = queryset.filter(author__username=options['author'])
+        elif options['group']:
+            queryset = queryset.filter(group__slug=options['group'])
+        lines = export_lines(queryset, options['format'],
+                             options['chunk_size'])
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        try:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as output:
+                output.writelines(lines)
+        except OSError as error:
+            raise CommandError(error)
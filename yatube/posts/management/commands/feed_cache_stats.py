@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import (feed_cache_timeout, get_feed_cache_stats,
+                         reset_feed_cache_stats)
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кеша фрагментов лент'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Обнулить счётчики после вывода',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_feed_cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f"hits: {stats['hits']}\n"
+            f"misses: {stats['misses']}\n"
+            f"hit ratio: {ratio:.1%}\n"
+            f"timeout: {feed_cache_timeout()} s"
+        )
+        if options['reset']:
+            reset_feed_cache_stats()
@@ -0,0 +1,64 @@
+from concurrent.futures import (ALL_COMPLETED, FIRST_COMPLETED,
+                                ThreadPoolExecutor, wait)
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.tasks import run_in_thread
+from posts.cache import post_tag
+from posts.models import Post
+from posts.signals import invalidate_feeds, post_feeds
+from posts.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = ('Создаёт недостающие миниатюры всех размеров для картинок '
+            'уже опубликованных постов')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+                            default=settings.POST_THUMBNAIL_WORKERS,
+                            help='Сколько потоков генерируют миниатюры; '
+                                 '0 — всё в основном потоке')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only(
+            'image', 'author', 'group').order_by('pk').iterator()
+        self.feeds = set()
+        self.processed = self.created = 0
+        if options['workers'] > 0:
+            self.generate_in_pool(posts, options['workers'])
+        else:
+            for post in posts:
+                self.record(post, generate_thumbnails(post.image))
+        # Ленты сбрасываем один раз в конце, а не после каждого поста.
+        if self.feeds:
+            invalidate_feeds(*self.feeds)
+        self.stdout.write(self.style.SUCCESS(
+            f'Картинок: {self.processed}, '
+            f'с новыми миниатюрами: {self.created}'))
+
+    def generate_in_pool(self, posts, workers):
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix='thumbnails') as pool:
+            pending = {}
+            for post in posts:
+                future = pool.submit(run_in_thread, generate_thumbnails,
+                                     post.image)
+                pending[future] = post
+                # Не ставим в очередь весь миллион картинок сразу.
+                if len(pending) >= workers * 4:
+                    self.collect(pending, FIRST_COMPLETED)
+            self.collect(pending, ALL_COMPLETED)
+
+    def collect(self, pending, return_when):
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            self.record(pending.pop(future), future.result())
+
+    def record(self, post, created):
+        self.processed += 1
+        if created:
+            self.created += 1
+            self.feeds.add(post_tag(post.pk))
+            self.feeds.update(post_feeds(post.author_id, post.group_id))
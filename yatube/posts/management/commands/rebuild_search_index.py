@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--optimize', action='store_true',
+            help='Слить сегменты индекса после перестройки',
+        )
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write('Полнотекстовый индекс есть только в SQLite')
+            return
+        rebuild_index(optimize=options['optimize'])
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен'))
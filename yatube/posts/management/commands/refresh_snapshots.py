@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from posts.snapshots import refresh_snapshots
+from posts.views import POSTS_PER_PAGE
+
+
+class Command(BaseCommand):
+    help = ('Перерисовывает устаревшие снимки первых страниц общей ленты '
+            'и активных групп; с --loop работает как фоновый воркер')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Не выходить, проверять ленты по кругу')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Пауза между проходами, с')
+
+    def handle(self, *args, **options):
+        while True:
+            refreshed = refresh_snapshots(POSTS_PER_PAGE)
+            if refreshed:
+                self.stdout.write(f"Обновлены: {', '.join(refreshed)}")
+            if not options['loop']:
+                break
+            # Долгоживущий процесс: не держим соединение вечно.
+            close_old_connections()
+            time.sleep(options['interval'])
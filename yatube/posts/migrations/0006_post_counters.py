@@ -0,0 +1,47 @@
+# Generated by Django 2.2.16 on 2026-10-18 13:15
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    AuthorCounter = apps.get_model('posts', 'AuthorCounter')
+    for group in Group.objects.annotate(actual=Count('posts')):
+        Group.objects.filter(pk=group.pk).update(posts_count=group.actual)
+    AuthorCounter.objects.bulk_create(
+        AuthorCounter(user_id=author_id, posts_count=count)
+        for author_id, count in Post.objects.order_by().values_list(
+            'author').annotate(Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0005_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Количество постов')),
+            ],
+            options={
+                'verbose_name': 'Счётчик постов автора',
+                'verbose_name_plural': 'Счётчики постов авторов',
+            },
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество постов'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
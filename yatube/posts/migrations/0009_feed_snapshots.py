@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-18 13:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedVersion',
+            fields=[
+                ('feed', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Лента')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'Версия ленты',
+                'verbose_name_plural': 'Версии лент',
+            },
+        ),
+        migrations.CreateModel(
+            name='FeedSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cursor', models.CharField(blank=True, help_text='Пустой у первой страницы', max_length=100, verbose_name='Курсор страницы')),
+                ('version', models.PositiveIntegerField(verbose_name='Версия ленты')),
+                ('html', models.TextField()),
+                ('previous_cursor', models.CharField(blank=True, max_length=100)),
+                ('next_cursor', models.CharField(blank=True, max_length=100)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('feed', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='posts.FeedVersion', verbose_name='Лента')),
+            ],
+            options={
+                'verbose_name': 'Снимок ленты',
+                'verbose_name_plural': 'Снимки лент',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='feedsnapshot',
+            constraint=models.UniqueConstraint(fields=('feed', 'cursor'), name='feed_snapshot_page_uniq'),
+        ),
+    ]
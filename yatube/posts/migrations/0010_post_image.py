@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-18 13:45
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+fts = import_module('posts.migrations.0008_post_fts')
+# SQLite добавляет и убирает столбец, пересоздавая таблицу, а вместе со
+# старой таблицей пропадают и триггеры полнотекстового индекса.
+restore_fts = fts.run_on_sqlite(fts.CREATE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_feed_snapshots'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_fts),
+        migrations.AddField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, upload_to='posts/', verbose_name='Картинка'),
+        ),
+        migrations.RunPython(restore_fts, migrations.RunPython.noop),
+    ]
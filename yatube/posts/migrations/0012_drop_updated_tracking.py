@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-18 16:12
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+fts = import_module('posts.migrations.0008_post_fts')
+# Изменение столбца SQLite делает пересозданием таблицы, триггеры
+# полнотекстового индекса при этом теряются.
+restore_fts = fts.run_on_sqlite(fts.CREATE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='authorcounter',
+            name='updated',
+        ),
+        migrations.RemoveField(
+            model_name='group',
+            name='updated',
+        ),
+        migrations.RunPython(migrations.RunPython.noop, restore_fts),
+        migrations.AlterField(
+            model_name='post',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(restore_fts, migrations.RunPython.noop),
+    ]
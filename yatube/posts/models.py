@@ -8,15 +8,43 @@ class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True)
     description = models.TextField()
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество постов',
+    )
 
     def __str__(self):
         return f'{self.title}'
 
 
+class PostQuerySet(models.QuerySet):
+    FEED_FIELDS = (
+        'text', 'pub_date', 'author', 'group',
+        'author__username', 'author__first_name', 'author__last_name',
+        'group__slug', 'image',
+    )
+
+    def feed(self):
+        """Посты для лент: автор и группа одним JOIN, только нужные поля."""
+        return self.select_related('author', 'group').only(
+            *self.FEED_FIELDS)
+
+    def detail(self):
+        return self.select_related('author', 'group').only(
+            *self.FEED_FIELDS, 'group__title')
+
+    def syndication(self):
+        return self.select_related('author', 'group').only(
+            *self.FEED_FIELDS, 'updated')
+
+
 class Post(models.Model):
     text = models.TextField(verbose_name='Текст')
     pub_date = models.DateTimeField(auto_now_add=True,
                                     verbose_name='Дата публикации')
+    updated = models.DateTimeField(auto_now=True,
+                                   verbose_name='Дата изменения')
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -32,11 +60,134 @@ class Post(models.Model):
         verbose_name='Сообщество',
         help_text='Группа, к которой будет относиться пост',
     )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True,
+    )
+
+    objects = PostQuerySet.as_manager()
 
     def __str__(self):
         return self.text[:15]
 
     class Meta:
-        ordering = ['-pub_date']
+        ordering = ['-pub_date', 'id']
+        indexes = [
+            models.Index(fields=['group', '-pub_date', 'id'],
+                         name='post_group_feed_idx'),
+            models.Index(fields=['author', '-pub_date', 'id'],
+                         name='post_author_feed_idx'),
+            models.Index(fields=['-pub_date', 'id'],
+                         name='post_feed_idx'),
+        ]
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
+
+
+class AuthorCounter(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_counter',
+        verbose_name='Пользователь',
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество постов',
+    )
+
+    def __str__(self):
+        return f'{self.user_id}: {self.posts_count}'
+
+    @classmethod
+    def get_count(cls, user):
+        count = cls.objects.filter(user=user).values_list(
+            'posts_count', flat=True).first()
+        return count or 0
+
+    class Meta:
+        verbose_name = 'Счётчик постов автора'
+        verbose_name_plural = 'Счётчики постов авторов'
+
+
+class FeedVersion(models.Model):
+    """Версия ленты для снимков: растёт в той же транзакции, что и запись
+    в ленту, поэтому снимок со старой версией не отдаётся."""
+    feed = models.CharField(
+        max_length=50,
+        primary_key=True,
+        verbose_name='Лента',
+    )
+    version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Версия',
+    )
+
+    def __str__(self):
+        return f'{self.feed}: {self.version}'
+
+    class Meta:
+        verbose_name = 'Версия ленты'
+        verbose_name_plural = 'Версии лент'
+
+
+class FeedSnapshot(models.Model):
+    """Готовый HTML одной из первых страниц ленты."""
+    feed = models.ForeignKey(
+        FeedVersion,
+        on_delete=models.CASCADE,
+        related_name='snapshots',
+        verbose_name='Лента',
+    )
+    cursor = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Курсор страницы',
+        help_text='Пустой у первой страницы',
+    )
+    version = models.PositiveIntegerField(verbose_name='Версия ленты')
+    html = models.TextField()
+    previous_cursor = models.CharField(max_length=100, blank=True)
+    next_cursor = models.CharField(max_length=100, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.feed_id} [{self.cursor or "первая"}]'
+
+    class Meta:
+        verbose_name = 'Снимок ленты'
+        verbose_name_plural = 'Снимки лент'
+        constraints = [
+            models.UniqueConstraint(fields=['feed', 'cursor'],
+                                    name='feed_snapshot_page_uniq'),
+        ]
+
+
+class ImportCheckpoint(models.Model):
+    """Сколько записей файла уже загрузил manage.py import_posts.
+
+    Обновляется в одной транзакции с пачкой постов, поэтому после сбоя
+    импорт продолжится ровно с первой незагруженной записи.
+    """
+    name = models.CharField(
+        max_length=200,
+        primary_key=True,
+        verbose_name='Имя',
+    )
+    records = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Загружено записей',
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+
+    def __str__(self):
+        return f'{self.name}: {self.records}'
+
+    class Meta:
+        verbose_name = 'Контрольная точка импорта'
+        verbose_name_plural = 'Контрольные точки импорта'
@@ -0,0 +1,223 @@
+import base64
+import binascii
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
+
+CURSOR_PARAM = 'cursor'
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+ELLIPSIS = '…'
+
+
+def make_cursor(direction, pub_date, pk):
+    raw = f'{direction}|{pub_date.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def encode_cursor(direction, post):
+    return make_cursor(direction, post.pub_date, post.pk)
+
+
+def decode_cursor(cursor):
+    """Вернуть (direction, pub_date, pk) или None для битого курсора."""
+    if not cursor:
+        return None
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or pub_date is None:
+        return None
+    return direction, pub_date, pk
+
+
+class CursorPaginator(Paginator):
+    """Keyset-пагинация по (pub_date, id) без COUNT и OFFSET.
+
+    Порядок ленты: сначала свежие посты, при равной дате — по id.
+    """
+    ordering = ('-pub_date', 'id')
+
+    def get_cursor_queryset(self, cursor):
+        """Вернуть (direction, queryset) для страницы после курсора.
+
+        Запрос берёт на одну запись больше страницы, чтобы узнать,
+        есть ли что-то дальше.
+        """
+        decoded = decode_cursor(cursor)
+        queryset = self.object_list.order_by(*self.ordering)
+        limit = self.per_page + 1
+        if decoded is None:
+            return None, queryset[:limit]
+        direction, pub_date, pk = decoded
+        # Лишнее на вид условие по одной pub_date даёт SQLite границу
+        # диапазона в индексе: без него OR заставляет идти по индексу
+        # с самого начала ленты.
+        if direction == CURSOR_NEXT:
+            return direction, queryset.filter(pub_date__lte=pub_date).filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+            )[:limit]
+        return direction, queryset.reverse().filter(
+            pub_date__gte=pub_date
+        ).filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+        )[:limit]
+
+    def get_cursor_page(self, cursor):
+        direction, queryset = self.get_cursor_queryset(cursor)
+        posts = list(queryset)
+        has_more = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        if direction == CURSOR_PREVIOUS:
+            return CursorPage(posts[::-1], self, has_more, True)
+        return CursorPage(posts, self, direction is not None, has_more)
+
+
+class CountedPaginator(Paginator):
+    """Paginator, которому число объектов передают готовым (из счётчика)."""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+    def get_elided_page_range(self, number=1, on_each_side=3, on_ends=1):
+        """Номера страниц вокруг текущей и по краям, остальное — ELLIPSIS.
+
+        Длина результата не зависит от числа страниц в ленте.
+        """
+        number = self.validate_number(number)
+        num_pages = self.num_pages
+        if num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield ELLIPSIS
+            yield from range(num_pages - on_ends + 1, num_pages + 1)
+        else:
+            yield from range(number + 1, num_pages + 1)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator для админки больших таблиц.
+
+    Без фильтров число строк оценивается по MAX(id) — это один шаг по
+    первичному ключу. Оценка — верхняя граница: удалённые строки она не
+    вычитает. Если запрошенная страница оказалась пустой, пагинатор
+    переходит на честный подсчёт и отдаёт последнюю непустую страницу.
+    С фильтрами считается честно сразу. Честный подсчёт живёт в кеше
+    count_timeout секунд.
+    """
+    count_timeout = 60
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            return queryset.aggregate(Max('pk'))['pk__max'] or 0
+        return self.exact_count()
+
+    def exact_count(self):
+        sql = str(self.object_list.query).encode()
+        key = 'paginator-count:' + hashlib.md5(sql).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, self.count_timeout)
+        return count
+
+    def page(self, number):
+        page = super().page(number)
+        if page.object_list or self.count == self.exact_count():
+            return page
+        # Оценка завысила число страниц: пересчитываем и не даём админке
+        # превратить ссылку из собственного пагинатора в ошибку ?e=1.
+        self.count = self.exact_count()
+        self.__dict__.pop('num_pages', None)
+        return super().page(min(int(number), self.num_pages))
+
+
+class CursorPage(Page):
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_previous, has_next):
+        super().__init__(object_list, None, paginator)
+        self._has_previous = has_previous and bool(object_list)
+        self._has_next = has_next and bool(object_list)
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next:
+            return encode_cursor(CURSOR_NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous:
+            return encode_cursor(CURSOR_PREVIOUS, self.object_list[0])
+
+
+class SnapshotPage(CursorPage):
+    """Страница, HTML которой уже отрисован в снимке ленты.
+
+    Постов в ней нет, от страницы нужны только ссылки пагинатора.
+    """
+
+    def __init__(self, paginator, previous_cursor, next_cursor):
+        super().__init__([], paginator, False, False)
+        self._previous_cursor = previous_cursor or None
+        self._next_cursor = next_cursor or None
+
+    def __repr__(self):
+        return '<Snapshot page>'
+
+    def has_next(self):
+        return self._next_cursor is not None
+
+    def has_previous(self):
+        return self._previous_cursor is not None
+
+    @property
+    def next_cursor(self):
+        return self._next_cursor
+
+    @property
+    def previous_cursor(self):
+        return self._previous_cursor
+
+
+def get_page(request, queryset, per_page, count=None):
+    """Страница ленты: курсорная, а для старых ссылок ?page= — нумерованная.
+
+    count — известное заранее число постов, чтобы не делать COUNT(*).
+    """
+    if 'page' in request.GET and CURSOR_PARAM not in request.GET:
+        paginator = CountedPaginator(
+            queryset.order_by(*CursorPaginator.ordering), per_page, count)
+        return paginator.get_page(request.GET.get('page'))
+    paginator = CursorPaginator(queryset, per_page)
+    return paginator.get_cursor_page(request.GET.get(CURSOR_PARAM))
@@ -0,0 +1,66 @@
+import re
+
+from django.db import connection
+
+FTS_TABLE = 'posts_post_fts'
+WORD_RE = re.compile(r'\w+')
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def to_fts_query(query):
+    """Превратить ввод пользователя в безопасный запрос FTS5.
+
+    Каждое слово берётся в кавычки, так что операторы и скобки из ввода
+    не ломают синтаксис; слова объединяются через AND.
+    """
+    words = WORD_RE.findall(query)
+    return ' '.join(f'"{word}"' for word in words)
+
+
+def filter_matching(queryset, query):
+    """Оставить в queryset постов только подходящие под запрос."""
+    fts_query = to_fts_query(query)
+    if not fts_query:
+        return queryset.none()
+    if not fts_available():
+        for word in WORD_RE.findall(query):
+            queryset = queryset.filter(text__icontains=word)
+        return queryset
+    # Не pk__in=RawSQL(...): Django обернёт подзапрос во вторые скобки,
+    # и SQLite вернёт из него только первую строку.
+    return queryset.extra(
+        where=[f'posts_post.id IN (SELECT rowid FROM {FTS_TABLE} '
+               f'WHERE {FTS_TABLE} MATCH %s)'],
+        params=[fts_query],
+    )
+
+
+def search_posts(queryset, query):
+    """Подходящие посты, самые релевантные (по bm25) первыми."""
+    fts_query = to_fts_query(query)
+    if not fts_query:
+        return queryset.none()
+    if not fts_available():
+        return filter_matching(queryset, query)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = posts_post.id',
+               f'{FTS_TABLE} MATCH %s'],
+        params=[fts_query],
+        select={'rank': f'{FTS_TABLE}.rank'},
+        order_by=['rank', '-pub_date'],
+    )
+
+
+def rebuild_index(optimize=False):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        if optimize:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
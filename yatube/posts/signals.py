@@ -0,0 +1,125 @@
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from core.tasks import enqueue_on_commit
+
+from .cache import (GLOBAL_FEED, author_feed, bump_feed_versions, group_feed,
+                    post_tag)
+from .counters import change_author_count, change_group_count
+from .models import Group, Post, User
+from .snapshots import bump_snapshot_versions
+from .thumbnails import generate_thumbnails
+
+
+def invalidate_feeds(*feeds):
+    # Сбрасываем версию сразу и ещё раз после коммита: иначе параллельный
+    # запрос успеет закешировать старые данные под новой версией.
+    bump_feed_versions(*feeds)
+    transaction.on_commit(lambda: bump_feed_versions(*feeds))
+    # Версии снимков живут в базе и меняются вместе с самой записью.
+    bump_snapshot_versions(feeds)
+
+
+def post_feeds(author_id, group_id):
+    feeds = [GLOBAL_FEED, author_feed(author_id)]
+    if group_id is not None:
+        feeds.append(group_feed(group_id))
+    return feeds
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_relations(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        instance._saved_relations = None
+        return
+    instance._saved_relations = Post.objects.filter(
+        pk=instance.pk).values_list('author_id', 'group_id').first()
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    saved = getattr(instance, '_saved_relations', None)
+    if created or saved is None:
+        change_author_count(instance.author_id, 1)
+        change_group_count(instance.group_id, 1)
+        return
+    author_id, group_id = saved
+    if author_id != instance.author_id:
+        change_author_count(author_id, -1)
+        change_author_count(instance.author_id, 1)
+    if group_id != instance.group_id:
+        change_group_count(group_id, -1)
+        change_group_count(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    change_author_count(instance.author_id, -1)
+    change_group_count(instance.group_id, -1)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_feeds(sender, instance, **kwargs):
+    feeds = post_feeds(instance.author_id, instance.group_id)
+    feeds.append(post_tag(instance.pk))
+    saved = getattr(instance, '_saved_relations', None)
+    if saved is not None:
+        feeds.extend(post_feeds(*saved))
+    invalidate_feeds(*feeds)
+
+
+def pregenerate_post_thumbnails(post_id):
+    post = Post.objects.filter(pk=post_id).only(
+        'image', 'author', 'group').first()
+    if post is None or not post.image:
+        return
+    # Закешированные страницы пока показывают саму картинку.
+    if generate_thumbnails(post.image):
+        invalidate_feeds(post_tag(post.pk),
+                         *post_feeds(post.author_id, post.group_id))
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_thumbnails(sender, instance, raw, **kwargs):
+    if raw or not instance.image:
+        return
+    enqueue_on_commit(pregenerate_post_thumbnails, instance.pk,
+                      dedup_key=f'thumbnails:{instance.pk}')
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_feeds(sender, instance, **kwargs):
+    invalidate_feeds(post_tag(instance.pk),
+                     *post_feeds(instance.author_id, instance.group_id))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_feeds(sender, instance, **kwargs):
+    # Ссылки на группу есть и в общей ленте, и в профилях её авторов.
+    author_ids = Post.objects.filter(group=instance).order_by().values_list(
+        'author_id', flat=True).distinct()
+    invalidate_feeds(GLOBAL_FEED, group_feed(instance.pk),
+                     *(author_feed(author_id) for author_id in author_ids))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_feed(sender, instance, update_fields=None,
+                           created=False, **kwargs):
+    # Вход пользователя обновляет только last_login — страницы не меняются.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    if created:
+        invalidate_feeds(author_feed(instance.pk))
+        return
+    # Имя автора выводится и в общей ленте, и в лентах его групп.
+    group_ids = Post.objects.filter(
+        author_id=instance.pk, group__isnull=False).order_by().values_list(
+        'group_id', flat=True).distinct()
+    invalidate_feeds(GLOBAL_FEED, author_feed(instance.pk),
+                     *(group_feed(group_id) for group_id in group_ids))
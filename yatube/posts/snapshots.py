@@ -0,0 +1,129 @@
+"""Снимки первых страниц общей ленты и самых активных групп.
+
+Воркер (manage.py refresh_snapshots) заранее рисует HTML страниц и
+кладёт его в FeedSnapshot. Любая запись в ленту увеличивает её
+FeedVersion в той же транзакции, после чего снимок перестаёт
+отдаваться, а воркер перерисовывает только эту ленту.
+
+Чтобы промах не стоил лишнего запроса, воркер оставляет в кеше
+подсказку «снимок есть»; запись в ленту её стирает. Подсказка только
+экономит запрос — решает всё равно версия в базе. До веб-процессов
+она доходит только через общий кеш: кеш в памяти процесса не
+пропускает проверка core.checks.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+
+from .cache import GLOBAL_FEED, group_feed
+from .models import FeedSnapshot, FeedVersion, Group, Post
+from .paginators import CURSOR_PARAM, CursorPaginator, SnapshotPage
+
+GROUP_FEED_PREFIX = group_feed('')
+SNAPSHOT_HINT_KEY = 'posts:snapshot:{}'
+FEED_TEMPLATES = {
+    GLOBAL_FEED: 'posts/includes/index_feed.html',
+    GROUP_FEED_PREFIX: 'posts/includes/group_feed.html',
+}
+
+
+def snapshot_hint_key(feed):
+    return SNAPSHOT_HINT_KEY.format(feed)
+
+
+def is_snapshot_feed(feed):
+    return feed == GLOBAL_FEED or feed.startswith(GROUP_FEED_PREFIX)
+
+
+def feed_template(feed):
+    if feed == GLOBAL_FEED:
+        return FEED_TEMPLATES[GLOBAL_FEED]
+    return FEED_TEMPLATES[GROUP_FEED_PREFIX]
+
+
+def feed_queryset(feed):
+    queryset = Post.objects.feed()
+    if feed == GLOBAL_FEED:
+        return queryset
+    return queryset.filter(group_id=int(feed[len(GROUP_FEED_PREFIX):]))
+
+
+def snapshot_feeds():
+    """Ленты, для которых держим снимки: общая и самые активные группы."""
+    group_ids = Group.objects.filter(posts_count__gt=0).order_by(
+        '-posts_count').values_list('pk', flat=True)[
+            :settings.FEED_SNAPSHOT_GROUPS]
+    return [GLOBAL_FEED, *(group_feed(group_id) for group_id in group_ids)]
+
+
+def bump_snapshot_versions(feeds):
+    feeds = [feed for feed in feeds if is_snapshot_feed(feed)]
+    if not feeds:
+        return
+    FeedVersion.objects.filter(feed__in=feeds).update(
+        version=F('version') + 1)
+    keys = [snapshot_hint_key(feed) for feed in feeds]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_snapshot_page(request, feed, per_page):
+    """(HTML, страница) из актуального снимка или (None, None)."""
+    if set(request.GET) - {CURSOR_PARAM}:
+        return None, None
+    if not cache.get(snapshot_hint_key(feed)):
+        return None, None
+    snapshot = FeedSnapshot.objects.filter(
+        feed=feed,
+        cursor=request.GET.get(CURSOR_PARAM, ''),
+        version=F('feed__version'),
+    ).values_list('html', 'previous_cursor', 'next_cursor').first()
+    if snapshot is None:
+        return None, None
+    html, previous_cursor, next_cursor = snapshot
+    paginator = CursorPaginator(feed_queryset(feed), per_page)
+    return html, SnapshotPage(paginator, previous_cursor, next_cursor)
+
+
+def render_snapshots(feed, version, per_page):
+    paginator = CursorPaginator(feed_queryset(feed), per_page)
+    template = feed_template(feed)
+    cursor = ''
+    for _ in range(settings.FEED_SNAPSHOT_PAGES):
+        page = paginator.get_cursor_page(cursor or None)
+        yield FeedSnapshot(
+            feed_id=feed,
+            cursor=cursor,
+            version=version,
+            html=render_to_string(template, {'page_obj': page}),
+            previous_cursor=page.previous_cursor or '',
+            next_cursor=page.next_cursor or '',
+        )
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+
+
+def refresh_snapshots(per_page):
+    """Перерисовать устаревшие и недостающие снимки; вернуть их ленты.
+
+    Версия читается до выборки постов: если запись успеет пройти, пока
+    страницы рисуются, снимок сразу окажется устаревшим и обновится
+    на следующем проходе, но чужие данные не отдаст.
+    """
+    refreshed = []
+    for feed in snapshot_feeds():
+        state, _ = FeedVersion.objects.get_or_create(feed=feed)
+        current = FeedSnapshot.objects.filter(
+            feed=feed, cursor='', version=state.version).exists()
+        if not current:
+            snapshots = list(render_snapshots(feed, state.version, per_page))
+            with transaction.atomic():
+                FeedSnapshot.objects.filter(feed=feed).delete()
+                FeedSnapshot.objects.bulk_create(snapshots)
+            refreshed.append(feed)
+        # Ставим и для уже готовых: кеш мог очиститься.
+        cache.set(snapshot_hint_key(feed), True, None)
+    return refreshed
@@ -0,0 +1,60 @@
+from urllib.parse import urlencode
+
+from django import template
+from django.core.cache import cache
+
+from core.replica import read_generation, replica_cache_timeout
+
+from posts.cache import (feed_cache_timeout, feed_fragment_key,
+                         record_feed_cache)
+from posts.paginators import CURSOR_PARAM
+
+PAGE_PARAMS = ('page', CURSOR_PARAM)
+
+register = template.Library()
+
+
+class FeedCacheNode(template.Node):
+    def __init__(self, nodelist, feed):
+        self.nodelist = nodelist
+        self.feed = feed
+
+    def render(self, context):
+        feed = self.feed.resolve(context)
+        request = context.get('request')
+        # Только параметры пагинации: прочие (?utm=...) не должны
+        # плодить копии фрагмента.
+        page_key = ''
+        if request is not None:
+            page_key = urlencode([(param, request.GET[param])
+                                  for param in PAGE_PARAMS
+                                  if param in request.GET])
+        # Фрагмент с отстающей реплики не должен достаться тому, кто
+        # закреплён за основной базой, и не должен пережить синхронизацию.
+        key = feed_fragment_key(feed, f'{read_generation()}:{page_key}')
+        fragment = cache.get(key)
+        record_feed_cache(fragment is not None)
+        if fragment is None:
+            fragment = self.nodelist.render(context)
+            cache.set(key, fragment,
+                      replica_cache_timeout(feed_cache_timeout()))
+        return fragment
+
+
+@register.tag('feed_cache')
+def do_feed_cache(parser, token):
+    """
+    Кеширует фрагмент ленты до следующей записи в неё.
+
+        {% feed_cache feed %} ... {% endfeed_cache %}
+
+    Ключ строится из ленты, её текущей версии, базы, с которой читает
+    view, и параметров пагинации.
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' принимает ровно один аргумент: ленту.")
+    nodelist = parser.parse(('endfeed_cache',))
+    parser.delete_first_token()
+    return FeedCacheNode(nodelist, parser.compile_filter(bits[1]))
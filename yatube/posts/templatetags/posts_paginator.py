@@ -0,0 +1,21 @@
+from django import template
+
+from posts.paginators import ELLIPSIS
+
+register = template.Library()
+
+
+@register.inclusion_tag('posts/includes/page_range.html', takes_context=True)
+def elided_page_range(context, page_obj, on_each_side=3, on_ends=1):
+    paginator = page_obj.paginator
+    if hasattr(paginator, 'get_elided_page_range'):
+        page_range = paginator.get_elided_page_range(
+            page_obj.number, on_each_side=on_each_side, on_ends=on_ends)
+    else:
+        page_range = paginator.page_range
+    return {
+        'page_obj': page_obj,
+        'page_range': page_range,
+        'ellipsis': ELLIPSIS,
+        'page_query': context.get('page_query', ''),
+    }
@@ -0,0 +1,25 @@
+from django import template
+
+from posts import thumbnails
+
+register = template.Library()
+
+
+@register.simple_tag
+def attach_thumbnails(posts, size):
+    """
+    Проставляет post.thumbnail всем постам страницы одним поиском:
+
+        {% attach_thumbnails page_obj 'feed' %}
+
+    Миниатюры не создаёт: пока воркер её не сделал, там None.
+    """
+    thumbnails.attach_thumbnails(posts, size)
+    return ''
+
+
+@register.simple_tag
+def post_thumbnail(post, size):
+    """{% post_thumbnail post 'detail' as thumbnail %}"""
+    thumbnails.attach_thumbnails([post], size)
+    return getattr(post, 'thumbnail', None)
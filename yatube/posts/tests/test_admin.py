@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+from posts.paginators import EstimatedCountPaginator
+
+
+class PostAdminChangelistTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def add_posts(self, count):
+        for i in range(count):
+            author = User.objects.create(
+                username=f'author_{Post.objects.count()}')
+            group = Group.objects.create(
+                title=f'Группа {author.pk}',
+                slug=f'group-{author.pk}',
+                description='Тестовое описание',
+            )
+            Post.objects.create(text='Тестовый текст', author=author,
+                                group=group)
+
+    def changelist_queries(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(
+                reverse('admin:posts_post_changelist'), params)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries]
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_posts(2)
+        few = len(self.changelist_queries())
+        self.add_posts(10)
+        self.assertEqual(len(self.changelist_queries()), few)
+
+    def test_changelist_has_no_full_count_and_no_group_select(self):
+        self.add_posts(3)
+        queries = self.changelist_queries()
+        self.assertFalse(any('COUNT(' in sql.upper() for sql in queries))
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist'))
+        self.assertNotContains(response, 'Группа 1</option>')
+        self.assertContains(response, 'admin-autocomplete')
+
+    def test_filtered_changelist_counts_exactly(self):
+        self.add_posts(3)
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'текст'})
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        author = User.objects.create(username='author')
+        posts = [Post.objects.create(text=f'Пост {i}', author=author)
+                 for i in range(6)]
+        # MAX(id) теперь как минимум втрое больше числа строк.
+        for post in posts[:4]:
+            post.delete()
+
+    def setUp(self):
+        cache.clear()
+
+    def paginator(self):
+        return EstimatedCountPaginator(Post.objects.order_by('pk'), 2)
+
+    def test_estimate_is_upper_bound(self):
+        self.assertGreaterEqual(self.paginator().count, 6)
+
+    def test_empty_page_falls_back_to_exact_count(self):
+        paginator = self.paginator()
+        page = paginator.page(3)
+        self.assertEqual(paginator.count, 2)
+        self.assertEqual(page.number, 1)
+        self.assertEqual(len(page.object_list), 2)
+
+    def test_page_with_rows_keeps_estimate(self):
+        paginator = self.paginator()
+        paginator.page(1)
+        self.assertGreaterEqual(paginator.count, 6)
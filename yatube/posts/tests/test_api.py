@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+
+
+class PostApiTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Тестовый текст {i}', author=cls.post_author,
+                 group=cls.group)
+            for i in range(15)
+        )
+        cls.post = Post.objects.order_by('-pub_date', 'id').first()
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_feeds_return_cursor_pages(self):
+        addresses = (
+            reverse('posts:api_posts'),
+            reverse('posts:api_group_posts',
+                    kwargs={'slug': self.group.slug}),
+            reverse('posts:api_profile_posts',
+                    kwargs={'username': self.post_author.username}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                first = self.guest_client.get(address).json()
+                self.assertEqual(len(first['results']), 10)
+                self.assertIsNone(first['previous'])
+                second = self.guest_client.get(first['next']).json()
+                self.assertEqual(len(second['results']), 5)
+                self.assertIsNone(second['next'])
+                ids = [row['id'] for row in first['results']
+                       + second['results']]
+                self.assertEqual(len(set(ids)), 15)
+                back = self.guest_client.get(second['previous']).json()
+                self.assertEqual(back['results'], first['results'])
+
+    def test_post_detail(self):
+        response = self.guest_client.get(
+            reverse('posts:api_post_detail', kwargs={'post_id': self.post.pk}))
+        data = response.json()
+        self.assertEqual(
+            set(data), {'id', 'text', 'pub_date', 'updated', 'author',
+                        'group'})
+        self.assertEqual(data['id'], self.post.pk)
+        self.assertEqual(data['text'], self.post.text)
+        self.assertEqual(data['author'], self.post_author.username)
+        self.assertEqual(data['group'], self.group.slug)
+
+    def test_fields_param_limits_payload(self):
+        response = self.guest_client.get(reverse('posts:api_posts'),
+                                         {'fields': 'text', 'limit': 3})
+        data = response.json()
+        self.assertEqual(data['results'][0], {'text': self.post.text})
+        self.assertEqual(len(data['results']), 3)
+        self.assertIn('fields=text', data['next'])
+
+    def test_bad_requests(self):
+        cases = (
+            (reverse('posts:api_posts') + '?fields=password', 400),
+            (reverse('posts:api_posts') + '?limit=много', 400),
+            (reverse('posts:api_post_detail', kwargs={'post_id': 999}), 404),
+            (reverse('posts:api_group_posts', kwargs={'slug': 'missing'}),
+             404),
+            (reverse('posts:api_profile_posts', kwargs={'username': 'nobody'}),
+             404),
+        )
+        for address, status in cases:
+            with self.subTest(address=address):
+                response = self.guest_client.get(address)
+                self.assertEqual(response.status_code, status)
+                self.assertIn('detail', response.json())
+
+    def test_feed_is_one_query_without_models(self):
+        # Валидатору общей ленты база не нужна: только сама страница.
+        with self.assertNumQueries(1):
+            self.guest_client.get(reverse('posts:api_posts'))
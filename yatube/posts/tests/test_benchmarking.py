@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from posts.benchmarking import (find_regressions, isolated_database,
+                                percentiles)
+
+
+def report(p95, queries):
+    return {'results': {'10000': {'posts:index': {
+        'p50': p95 / 2, 'p95': p95, 'p99': p95, 'max': p95,
+        'queries': queries, 'peak_kib': 100,
+    }}}}
+
+
+class FindRegressionsTest(SimpleTestCase):
+    def test_within_tolerance_is_not_a_regression(self):
+        self.assertEqual(
+            find_regressions(report(10, 3), report(11.5, 3), 0.2), [])
+
+    def test_slower_or_chattier_views_are_flagged(self):
+        cases = (
+            (report(10, 3), report(13, 3)),
+            (report(10, 3), report(10, 4)),
+        )
+        for baseline, current in cases:
+            with self.subTest(current=current):
+                regressions = find_regressions(baseline, current, 0.2)
+                self.assertEqual(len(regressions), 1)
+                self.assertIn('posts:index', regressions[0])
+
+    def test_new_views_and_sizes_are_skipped(self):
+        self.assertEqual(find_regressions({'results': {}}, report(10, 3)), [])
+
+    def test_percentiles(self):
+        result = percentiles(list(range(1, 101)))
+        self.assertEqual(result['p50'], 50.5)
+        self.assertEqual(result['p95'], 96)
+        self.assertEqual(result['max'], 100)
+
+
+class IsolatedDatabaseTest(SimpleTestCase):
+    @mock.patch('posts.benchmarking.teardown_databases')
+    @mock.patch('posts.benchmarking.setup_databases')
+    def test_cache_is_private_to_the_block(self, *mocks):
+        cache.set('bench-marker', 'сайт')
+        self.addCleanup(cache.delete, 'bench-marker')
+        with isolated_database():
+            self.assertIsNone(cache.get('bench-marker'))
+            cache.set('bench-only', 1)
+            cache.clear()
+        self.assertEqual(cache.get('bench-marker'), 'сайт')
+        self.assertIsNone(cache.get('bench-only'))
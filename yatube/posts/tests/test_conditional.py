@@ -0,0 +1,97 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+        self.addresses = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:profile', kwargs={'username': 'post_author'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+
+    def test_matching_etag_gets_304_before_rendering(self):
+        for address in self.addresses:
+            with self.subTest(address=address):
+                etag = self.authorized_client.get(address)['ETag']
+                response = self.authorized_client.get(
+                    address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertIsNone(response.context)
+
+    def test_last_modified_gets_304(self):
+        for address in self.addresses:
+            with self.subTest(address=address):
+                last_modified = self.authorized_client.get(
+                    address)['Last-Modified']
+                response = self.authorized_client.get(
+                    address, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, 304)
+
+    def test_post_change_changes_etag(self):
+        etags = [self.authorized_client.get(address)['ETag']
+                 for address in self.addresses]
+        self.post.text = 'Изменённый текст'
+        self.post.save()
+        for address, etag in zip(self.addresses, etags):
+            with self.subTest(address=address):
+                response = self.authorized_client.get(
+                    address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def assert_modified(self, address, change):
+        last_modified = self.authorized_client.get(address)['Last-Modified']
+        # Last-Modified точен до секунды: изменение — секундой позже.
+        later = time.time() + 2
+        with mock.patch('core.cache.time.time', return_value=later):
+            change()
+        response = self.authorized_client.get(
+            address, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_delete_changes_last_modified(self):
+        post = Post.objects.create(text='Лишний пост',
+                                   author=self.post_author)
+        self.assert_modified(reverse('posts:index'), post.delete)
+
+    def test_group_change_changes_last_modified(self):
+        def change_slug():
+            self.group.slug = 'new-slug'
+            self.group.save()
+
+        self.assert_modified(reverse('posts:index'), change_slug)
+
+    def test_cached_anonymous_page_answers_304(self):
+        guest_client = Client()
+        etag = guest_client.get(self.addresses[0])['ETag']
+        with self.assertNumQueries(0):
+            response = guest_client.get(self.addresses[0],
+                                        HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import AuthorCounter, Post, Group, User
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.group_2 = Group.objects.create(
+            title='Тестовая группа_2',
+            slug='test-slug-2',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def assertCounts(self, author, group, group_2):
+        self.group.refresh_from_db()
+        self.group_2.refresh_from_db()
+        self.assertEqual(AuthorCounter.get_count(self.post_author), author)
+        self.assertEqual(self.group.posts_count, group)
+        self.assertEqual(self.group_2.posts_count, group_2)
+
+    def test_create_edit_and_delete_update_counters(self):
+        self.authorized_client.post(reverse('posts:post_create'), data={
+            'text': 'Тестовый текст',
+            'group': self.group.pk,
+        })
+        self.assertCounts(1, 1, 0)
+        post = Post.objects.get()
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'pk': post.pk}),
+            data={'text': 'Тестовый текст', 'group': self.group_2.pk})
+        self.assertCounts(1, 0, 1)
+        post.refresh_from_db()
+        post.delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_author_delete_cascades_counters(self):
+        user = User.objects.create_user(username='StasBasov')
+        Post.objects.create(text='Тестовый текст', author=user,
+                            group=self.group)
+        user.delete()
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 0)
+        self.assertFalse(AuthorCounter.objects.exists())
+
+    def test_pages_read_counters(self):
+        post = Post.objects.create(text='Тестовый текст',
+                                   author=self.post_author)
+        addresses = (
+            reverse('posts:profile', kwargs={'username': 'post_author'}),
+            reverse('posts:post_detail', kwargs={'post_id': post.pk}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.authorized_client.get(address)
+                self.assertEqual(response.context['posts_count'], 1)
+
+    def test_recount_posts_repairs_drift(self):
+        Post.objects.bulk_create([
+            Post(text='Тестовый текст', author=self.post_author,
+                 group=self.group),
+            Post(text='Тестовый текст', author=self.post_author),
+        ])
+        self.assertCounts(0, 0, 0)
+        call_command('recount_posts', stdout=StringIO())
+        self.assertCounts(2, 1, 0)
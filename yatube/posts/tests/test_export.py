@@ -0,0 +1,88 @@
+import csv
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+
+
+class ExportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.random_user = User.objects.create(
+            username='random_user',
+        )
+        cls.staff = User.objects.create(
+            username='staff',
+            is_staff=True,
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(3):
+            Post.objects.create(text=f'Текст, с "кавычками" {i}',
+                                author=cls.post_author, group=cls.group)
+        Post.objects.create(text='Чужой пост', author=cls.random_user)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_author_exports_own_posts_as_csv(self):
+        response = self.authorized_client.get(reverse(
+            'posts:export_profile',
+            kwargs={'username': 'post_author', 'fmt': 'csv'}))
+        rows = list(csv.DictReader(StringIO(self.read(response))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['text'], 'Текст, с "кавычками" 0')
+        self.assertEqual(rows[0]['group'], 'test-slug')
+
+    def test_export_is_forbidden_for_others(self):
+        addresses = (
+            reverse('posts:export_profile',
+                    kwargs={'username': 'random_user', 'fmt': 'csv'}),
+            reverse('posts:export_group',
+                    kwargs={'slug': 'test-slug', 'fmt': 'csv'}),
+            reverse('posts:export_all', kwargs={'fmt': 'csv'}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.authorized_client.get(address)
+                self.assertEqual(response.status_code, 403)
+
+    def test_staff_exports_group_and_site_as_jsonl(self):
+        expected = {
+            reverse('posts:export_group',
+                    kwargs={'slug': 'test-slug', 'fmt': 'jsonl'}): 3,
+            reverse('posts:export_all', kwargs={'fmt': 'jsonl'}): 4,
+        }
+        for address, count in expected.items():
+            with self.subTest(address=address):
+                lines = self.read(self.staff_client.get(address)).splitlines()
+                self.assertEqual(len(lines), count)
+                self.assertIn('author', json.loads(lines[0]))
+
+    def test_unknown_format_is_404(self):
+        response = self.staff_client.get(
+            reverse('posts:export_all', kwargs={'fmt': 'xml'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command('export_posts', '--group', 'test-slug', stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.cache import get_feed_cache_stats
+from posts.models import Post, Group, User
+
+
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        # Анонимам страницы целиком отдаёт кеш страниц, поэтому фрагменты
+        # проверяем под авторизованным пользователем.
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def test_second_render_is_a_hit(self):
+        self.authorized_client.get(reverse('posts:index'))
+        self.authorized_client.get(reverse('posts:index'))
+        self.assertEqual(get_feed_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_unrelated_params_share_fragment(self):
+        self.authorized_client.get(reverse('posts:index'))
+        self.authorized_client.get(reverse('posts:index') + '?utm=mail')
+        self.assertEqual(get_feed_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_page_param_gets_own_fragment(self):
+        self.authorized_client.get(reverse('posts:index'))
+        self.authorized_client.get(reverse('posts:index') + '?page=1')
+        self.assertEqual(get_feed_cache_stats(), {'hits': 0, 'misses': 2})
+
+    def test_new_post_invalidates_its_feeds(self):
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:profile', kwargs={'username': 'post_author'}),
+        )
+        for address in addresses:
+            self.authorized_client.get(address)
+        Post.objects.create(text='Свежий пост', author=self.post_author,
+                            group=self.group)
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.authorized_client.get(address)
+                self.assertContains(response, 'Свежий пост')
+
+    def test_edit_outside_feed_keeps_cache(self):
+        other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+        address = reverse('posts:group_list', kwargs={'slug': 'other-slug'})
+        self.authorized_client.get(address)
+        self.post.text = 'Изменённый текст'
+        self.post.save()
+        self.authorized_client.get(address)
+        self.assertEqual(get_feed_cache_stats()['hits'], 1)
+        other_group.refresh_from_db()
+        self.assertEqual(other_group.posts_count, 0)
+
+    def test_group_rename_invalidates_index(self):
+        self.authorized_client.get(reverse('posts:index'))
+        self.group.slug = 'new-slug'
+        self.group.save()
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, 'new-slug')
+        self.group.slug = 'test-slug'
+        self.group.save()
@@ -0,0 +1,98 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+
+
+class PostFeedsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def feed_addresses(self):
+        for kind in ('rss', 'atom'):
+            yield reverse(f'posts:feed_{kind}')
+            yield reverse(f'posts:group_feed_{kind}',
+                          kwargs={'slug': self.group.slug})
+            yield reverse(f'posts:profile_feed_{kind}',
+                          kwargs={'username': self.post_author.username})
+
+    def test_feeds_list_posts(self):
+        for address in self.feed_addresses():
+            with self.subTest(address=address):
+                response = self.guest_client.get(address)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, self.post.text)
+                self.assertIn('ETag', response)
+                self.assertIn('Last-Modified', response)
+
+    def test_unknown_group_and_author_return_404(self):
+        addresses = (
+            reverse('posts:group_feed_rss', kwargs={'slug': 'missing'}),
+            reverse('posts:profile_feed_atom', kwargs={'username': 'nobody'}),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.guest_client.get(address)
+                self.assertEqual(response.status_code, 404)
+
+    def test_repeated_poll_is_served_from_cache(self):
+        for address in self.feed_addresses():
+            with self.subTest(address=address):
+                self.guest_client.get(address)
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(address)
+                self.assertEqual(response['X-Page-Cache'], 'hit')
+
+    def test_conditional_poll_returns_not_modified(self):
+        address = reverse('posts:feed_rss')
+        etag = self.guest_client.get(address)['ETag']
+        response = Client().get(address, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleted_newest_post_is_not_hidden_by_last_modified(self):
+        address = reverse('posts:feed_rss')
+        fresh = Post.objects.create(text='Свежий пост',
+                                    author=self.post_author)
+        last_modified = self.guest_client.get(address)['Last-Modified']
+        with mock.patch('core.cache.time.time',
+                        return_value=time.time() + 10):
+            fresh.delete()
+        # Первый опрос после удаления кладёт ленту в кеш страниц; её
+        # Last-Modified не должен откатиться к дате предыдущего поста.
+        Client().get(address)
+        response = Client().get(address,
+                                HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Свежий пост')
+
+    def test_new_post_invalidates_feeds(self):
+        for address in self.feed_addresses():
+            self.guest_client.get(address)
+        Post.objects.create(text='Свежий пост', author=self.post_author,
+                            group=self.group)
+        for address in self.feed_addresses():
+            with self.subTest(address=address):
+                response = self.guest_client.get(address)
+                self.assertContains(response, 'Свежий пост')
@@ -0,0 +1,134 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import (AuthorCounter, ImportCheckpoint, Post,
+                          Group, User)
+
+TEMP_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+class ImportPostsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(TEMP_DIR, name)
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def import_posts(self, *args):
+        out = StringIO()
+        call_command('import_posts', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_import_jsonl(self):
+        records = [
+            {'text': f'Текст {i}', 'author': 'post_author',
+             'group': 'test-slug', 'pub_date': f'2020-01-0{i + 1}T10:00:00Z'}
+            for i in range(5)
+        ] + [{'text': 'Чужой', 'author': 'nobody'}]
+        path = self.write('posts.jsonl', '\n'.join(map(json.dumps, records)))
+        self.import_posts(path, '--batch-size', '2')
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 5)
+        self.assertEqual(
+            Post.objects.first().pub_date.isoformat(),
+            '2020-01-05T10:00:00+00:00')
+        self.assertEqual(AuthorCounter.get_count(self.post_author), 5)
+
+    def test_import_csv(self):
+        path = self.write('posts.csv', 'text,author,group\n'
+                                       'Первый,post_author,\n'
+                                       'Второй,post_author,test-slug\n')
+        self.import_posts(path)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(Post.objects.filter(group=None).count(), 1)
+
+    def test_unknown_group_is_skipped(self):
+        path = self.write('posts.csv', 'text,author,group\n'
+                                       'Первый,post_author,no-such-group\n'
+                                       'Второй,post_author,test-slug\n')
+        err = StringIO()
+        call_command('import_posts', path, stdout=StringIO(), stderr=err)
+        self.assertEqual(list(Post.objects.values_list('text', flat=True)),
+                         ['Второй'])
+        self.assertIn("Нет группы 'no-such-group'", err.getvalue())
+
+    def test_record_without_text_is_skipped(self):
+        lines = [json.dumps({'author': 'post_author'}),
+                 json.dumps({'text': 'Второй', 'author': 'post_author'})]
+        path = self.write('posts.jsonl', '\n'.join(lines))
+        err = StringIO()
+        out = StringIO()
+        call_command('import_posts', path, stdout=out, stderr=err)
+        self.assertEqual(list(Post.objects.values_list('text', flat=True)),
+                         ['Второй'])
+        self.assertIn('пропущено 1', out.getvalue())
+        self.assertIn('Запись без текста', err.getvalue())
+
+    def test_resumed_empty_run_recounts(self):
+        # Прерванный запуск закоммитил пачку, но до пересчёта не дошёл.
+        Post.objects.bulk_create([
+            Post(text='Текст 0', author=self.post_author)])
+        ImportCheckpoint.objects.create(name='posts', records=1)
+        path = self.write('posts.jsonl', json.dumps(
+            {'text': 'Текст 0', 'author': 'post_author'}))
+        self.import_posts(path, '--checkpoint', 'posts')
+        self.assertEqual(AuthorCounter.get_count(self.post_author), 1)
+
+    def test_checkpoint_resumes_import(self):
+        ImportCheckpoint.objects.create(name='posts', records=2)
+        lines = [json.dumps({'text': f'Текст {i}', 'author': 'post_author'})
+                 for i in range(3)]
+        path = self.write('posts.jsonl', '\n'.join(lines))
+        self.import_posts(path, '--checkpoint', 'posts')
+        self.assertEqual(list(Post.objects.values_list('text', flat=True)),
+                         ['Текст 2'])
+        self.assertEqual(ImportCheckpoint.objects.get(name='posts').records,
+                         3)
+
+    def test_checkpoint_is_saved_with_its_batch(self):
+        lines = [json.dumps({'text': f'Текст {i}', 'author': 'post_author'})
+                 for i in range(4)]
+        path = self.write('posts.jsonl', '\n'.join(lines))
+        bulk_create = Post.objects.bulk_create
+        calls = []
+
+        def fail_second_batch(posts):
+            calls.append(posts)
+            if len(calls) == 2:
+                raise OSError('сбой')
+            return bulk_create(posts)
+
+        with mock.patch.object(Post.objects, 'bulk_create',
+                               side_effect=fail_second_batch):
+            with self.assertRaises(OSError):
+                self.import_posts(path, '--batch-size', '2',
+                                  '--checkpoint', 'posts')
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(ImportCheckpoint.objects.get(name='posts').records,
+                         2)
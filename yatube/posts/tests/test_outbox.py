@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends.filebased import EmailBackend
+from django.core.management import call_command
+from django.test import Client, TestCase, TransactionTestCase
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mail import send_outbox
+from core.models import OutgoingEmail, Task
+from posts.models import User
+
+TEMP_EMAIL_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+OUTBOX_SETTINGS = {
+    'EMAIL_BACKEND': 'core.mail.OutboxBackend',
+    'OUTBOX_EMAIL_BACKEND': 'django.core.mail.backends.filebased.EmailBackend',
+    'EMAIL_FILE_PATH': TEMP_EMAIL_DIR,
+}
+
+
+def sent_files():
+    return [os.path.join(TEMP_EMAIL_DIR, name)
+            for name in os.listdir(TEMP_EMAIL_DIR)]
+
+
+def clear_sent_files():
+    shutil.rmtree(TEMP_EMAIL_DIR, ignore_errors=True)
+    os.makedirs(TEMP_EMAIL_DIR)
+
+
+@override_settings(**OUTBOX_SETTINGS)
+class EmailOutboxTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_EMAIL_DIR, ignore_errors=True)
+
+    def setUp(self):
+        clear_sent_files()
+
+    def send_mails(self, count):
+        for i in range(count):
+            mail.send_mail(f'Тема {i}', 'Текст', 'noreply@yatube.ru',
+                           [f'user{i}@yatube.ru'])
+
+    def test_send_mail_only_queues(self):
+        self.send_mails(2)
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+        self.assertEqual(sent_files(), [])
+
+    def test_batch_uses_one_connection(self):
+        self.send_mails(3)
+        self.assertEqual(send_outbox(), (3, 0))
+        self.assertFalse(OutgoingEmail.objects.exists())
+        # Файловый backend пишет в новый файл каждое соединение.
+        [path] = sent_files()
+        with open(path) as sent:
+            content = sent.read()
+        for i in range(3):
+            self.assertIn(f'To: user{i}@yatube.ru', content)
+
+    def test_failed_message_is_retried_later(self):
+        self.send_mails(1)
+        with mock.patch.object(EmailBackend, 'send_messages',
+                               side_effect=OSError('нет связи')):
+            self.assertEqual(send_outbox(), (0, 1))
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.claim, '')
+        self.assertIn('нет связи', email.last_error)
+        self.assertGreater(email.next_attempt, timezone.now())
+        retry = Task.objects.get(dedup_key='outbox')
+        self.assertGreater(retry.run_at, timezone.now() + timedelta(seconds=5))
+
+        # Пока пауза не прошла, письмо не трогаем.
+        self.assertEqual(send_outbox(), (0, 0))
+        OutgoingEmail.objects.update(next_attempt=timezone.now())
+        self.assertEqual(send_outbox(), (1, 0))
+
+
+@override_settings(**OUTBOX_SETTINGS)
+class PasswordResetOutboxTest(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_EMAIL_DIR, ignore_errors=True)
+
+    def setUp(self):
+        clear_sent_files()
+        User.objects.create_user(username='reader', email='reader@yatube.ru',
+                                 password='password')
+
+    def test_password_reset_is_sent_by_worker(self):
+        response = Client().post(reverse('password_reset'),
+                                 {'email': 'reader@yatube.ru'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+        self.assertEqual(sent_files(), [])
+
+        call_command('run_tasks', once=True, threads=0, stdout=StringIO())
+        self.assertFalse(OutgoingEmail.objects.exists())
+        [path] = sent_files()
+        with open(path) as sent:
+            self.assertIn('To: reader@yatube.ru', sent.read())
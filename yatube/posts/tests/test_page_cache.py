@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+
+
+class AnonymousPageCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.group_2 = Group.objects.create(
+            title='Тестовая группа_2',
+            slug='test-slug-2',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def test_anonymous_pages_are_cached(self):
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+            reverse('posts:profile', kwargs={'username': 'post_author'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+            reverse('about:author'),
+            reverse('about:tech'),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                self.guest_client.get(address)
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(address)
+                self.assertEqual(response['X-Page-Cache'], 'hit')
+
+    def test_authorized_pages_are_not_cached(self):
+        self.authorized_client.get(reverse('posts:index'))
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('X-Page-Cache'))
+
+    def test_post_edit_purges_only_tagged_pages(self):
+        detail = reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        other_group = reverse('posts:group_list',
+                              kwargs={'slug': 'test-slug-2'})
+        self.guest_client.get(detail)
+        self.guest_client.get(other_group)
+        self.post.text = 'Изменённый текст'
+        self.post.save()
+        response = self.guest_client.get(detail)
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        self.assertContains(response, 'Изменённый текст')
+        response = self.guest_client.get(other_group)
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+
+    def test_group_change_purges_group_page(self):
+        address = reverse('posts:group_list', kwargs={'slug': 'test-slug'})
+        self.guest_client.get(address)
+        self.group.title = 'Новое название'
+        self.group.save()
+        response = self.guest_client.get(address)
+        self.assertContains(response, 'Новое название')
@@ -1,7 +1,10 @@
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from posts.models import Post, Group, User
+from posts.paginators import ELLIPSIS, CountedPaginator
 from posts.views import POSTS_PER_PAGE
 
 
@@ -44,3 +47,56 @@ class PaginatorViewsTest(TestCase):
                 response = self.authorized_client.get(address)
                 self.assertEqual(len(response.context['page_obj']),
                                  POSTS_PER_PAGE)
+
+    def test_cursor_pages_follow_each_other(self):
+        address = reverse('posts:index')
+        first = self.authorized_client.get(address).context['page_obj']
+        self.assertTrue(first.has_next())
+        self.assertFalse(first.has_previous())
+        second = self.authorized_client.get(
+            address, {'cursor': first.next_cursor}).context['page_obj']
+        self.assertEqual(len(second), 2)
+        self.assertFalse(second.has_next())
+        self.assertTrue(second.has_previous())
+        self.assertFalse(set(first) & set(second))
+        back = self.authorized_client.get(
+            address, {'cursor': second.previous_cursor}).context['page_obj']
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+
+    def test_cursor_page_runs_no_count_or_offset(self):
+        address = reverse('posts:group_list', kwargs={'slug': 'test-slug'})
+        with CaptureQueriesContext(connection) as queries:
+            self.authorized_client.get(address)
+        sql = ' '.join(query['sql'] for query in queries).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_broken_cursor_shows_first_page(self):
+        response = self.authorized_client.get(
+            reverse('posts:index'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(len(response.context['page_obj']), POSTS_PER_PAGE)
+
+    def test_page_number_links_still_work(self):
+        response = self.authorized_client.get(
+            reverse('posts:index'), {'page': 2})
+        self.assertEqual(response.context['page_obj'].number, 2)
+        self.assertEqual(len(response.context['page_obj']), 2)
+
+    def test_elided_page_range_is_windowed(self):
+        paginator = CountedPaginator(range(500000), POSTS_PER_PAGE)
+        self.assertEqual(
+            list(paginator.get_elided_page_range(25000)),
+            [1, ELLIPSIS, 24997, 24998, 24999, 25000, 25001, 25002, 25003,
+             ELLIPSIS, 50000],
+        )
+        self.assertEqual(list(paginator.get_elided_page_range(2)),
+                         [1, 2, 3, 4, 5, ELLIPSIS, 50000])
+        short = CountedPaginator(range(30), POSTS_PER_PAGE)
+        self.assertEqual(list(short.get_elided_page_range(2)), [1, 2, 3])
+
+    def test_numbered_paginator_renders_window(self):
+        response = self.authorized_client.get(
+            reverse('posts:index'), {'page': 1})
+        self.assertContains(response, '?page=2')
+        self.assertNotContains(response, ELLIPSIS)
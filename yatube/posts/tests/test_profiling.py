@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from django.core.cache import cache
+from django.test import (Client, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import reverse
+
+from core.profiling import RequestProfile, make_token
+from posts.models import Post, User
+
+PROFILING_DIR = tempfile.mkdtemp()
+
+
+@override_settings(PROFILING_DIR=PROFILING_DIR, PROFILING_SAMPLE_RATE=0)
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(username='post_author')
+        Post.objects.create(text='Тестовый текст', author=cls.post_author)
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PROFILING_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        self.address = reverse('posts:profile',
+                               kwargs={'username': 'post_author'})
+
+    def profile_files(self, profile_id):
+        directory = os.path.join(PROFILING_DIR, 'posts.profile')
+        return [os.path.join(directory, f'{profile_id}.{extension}')
+                for extension in ('prof', 'txt')]
+
+    def test_signed_header_or_param_profiles_request(self):
+        cases = (
+            {'HTTP_X_PROFILE': make_token()},
+            {'QUERY_STRING': f'_profile={make_token()}'},
+        )
+        for extra in cases:
+            with self.subTest(extra=extra):
+                response = self.guest_client.get(self.address, **extra)
+                for path in self.profile_files(response['X-Profile-Id']):
+                    self.assertTrue(os.path.isfile(path))
+                with open(path, encoding='utf-8') as report:
+                    text = report.read()
+                self.assertIn('view: posts:profile', text)
+                self.assertIn('Аллокации за запрос', text)
+
+    def test_unsigned_requests_are_not_profiled(self):
+        for extra in ({}, {'HTTP_X_PROFILE': 'profile:forged:token'}):
+            with self.subTest(extra=extra):
+                response = self.guest_client.get(self.address, **extra)
+                self.assertNotIn('X-Profile-Id', response)
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_profiled(self):
+        response = self.guest_client.get(self.address)
+        self.assertIn('X-Profile-Id', response)
+
+    def test_admin_lists_and_downloads_profiles(self):
+        profile_id = self.guest_client.get(
+            self.address, HTTP_X_PROFILE=make_token())['X-Profile-Id']
+        response = self.admin_client.get(reverse('core:profile_list'))
+        self.assertContains(response, profile_id)
+        download = reverse('core:profile_download',
+                           args=('posts.profile', profile_id, 'txt'))
+        response = self.admin_client.get(download)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'posts:profile', b''.join(response.streaming_content))
+        response = self.guest_client.get(download)
+        self.assertEqual(response.status_code, 302)
+
+    def test_download_rejects_foreign_paths(self):
+        addresses = (
+            reverse('core:profile_download',
+                    args=('..', 'settings', 'txt')),
+            reverse('core:profile_download',
+                    args=('posts.profile', 'missing', 'txt')),
+            reverse('core:profile_download',
+                    args=('posts.profile', 'missing', 'py')),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.admin_client.get(address)
+                self.assertEqual(response.status_code, 404)
+
+
+class RequestProfileTest(SimpleTestCase):
+    def test_overlapping_profiles_share_tracemalloc(self):
+        was_tracing = tracemalloc.is_tracing()
+        first, second = RequestProfile(), RequestProfile()
+        # Как два запроса в разных потоках: первый закончился раньше.
+        first.__enter__()
+        second.__enter__()
+        first.__exit__(None, None, None)
+        self.assertTrue(tracemalloc.is_tracing())
+        second.__exit__(None, None, None)
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+        self.assertGreater(second.peak, 0)
@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+from posts.views import POSTS_PER_PAGE
+
+
+class FeedQueryBudgetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+            first_name='Лев',
+            last_name='Толстой',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        # У каждого поста свой автор и своя группа, чтобы N+1 был виден.
+        for i in range(POSTS_PER_PAGE + 2):
+            author = User.objects.create(username=f'author_{i}')
+            group = Group.objects.create(
+                title=f'Группа {i}',
+                slug=f'group-{i}',
+                description='Тестовое описание',
+            )
+            Post.objects.create(text=f'Тестовый текст {i}', author=author,
+                                group=group)
+        for i in range(POSTS_PER_PAGE + 2):
+            Post.objects.create(text=f'Текст автора {i}',
+                                author=cls.post_author, group=cls.group)
+        cls.post = Post.objects.filter(author=cls.post_author).first()
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_read_views_query_budget(self):
+        # Первый запрос view с объектом — поиск его id для условного
+        # GET; общей ленте он не нужен.
+        budgets = {
+            reverse('posts:index'): 1,
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}): 3,
+            reverse('posts:profile',
+                    kwargs={'username': 'post_author'}): 4,
+            reverse('posts:post_detail',
+                    kwargs={'post_id': self.post.pk}): 3,
+        }
+        for address, queries in budgets.items():
+            with self.subTest(address=address):
+                with self.assertNumQueries(queries):
+                    response = self.guest_client.get(address)
+                self.assertEqual(response.status_code, 200)
+
+    def test_feed_renders_related_fields(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Лев Толстой')
+        group_url = reverse('posts:group_list', kwargs={'slug': 'test-slug'})
+        self.assertContains(response, group_url)
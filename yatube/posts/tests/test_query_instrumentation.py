@@ -0,0 +1,59 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.queries import (QueryBudgetExceeded, budget_violations,
+                          record_queries)
+from posts.models import Post, User
+
+
+class QueryInstrumentationTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for i in range(3):
+            author = User.objects.create(username=f'author_{i}')
+            Post.objects.create(text=f'Тестовый текст {i}', author=author)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_server_timing_header(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertRegex(response['Server-Timing'],
+                         r'^db;dur=[\d.]+;desc="\d+ queries"$')
+
+    def test_request_is_logged_by_view_name(self):
+        with self.assertLogs('yatube.queries', 'DEBUG') as logs:
+            self.guest_client.get(reverse('posts:index'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view_name'], 'posts:index')
+        self.assertGreater(record['queries'], 0)
+        self.assertEqual(record['violations'], [])
+
+    @override_settings(QUERY_BUDGETS={'posts:index': 0},
+                       QUERY_BUDGET_STRICT=False)
+    def test_over_budget_warns_in_production(self):
+        with self.assertLogs('yatube.queries', 'WARNING') as logs:
+            response = self.guest_client.get(reverse('posts:index'))
+        self.assertEqual(response.status_code, 200)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertIn('бюджете 0', record['violations'][0])
+
+    @override_settings(QUERY_BUDGETS={'posts:index': 0},
+                       QUERY_BUDGET_STRICT=True)
+    def test_over_budget_fails_in_ci(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.guest_client.get(reverse('posts:index'))
+
+    @override_settings(QUERY_DUPLICATE_LIMIT=3)
+    def test_n_plus_one_is_detected(self):
+        with record_queries() as recorder:
+            for post in Post.objects.all():
+                post.author.get_full_name()
+        violations = budget_violations('posts:index', recorder)
+        self.assertEqual(len(violations), 1)
+        self.assertIn('3 одинаковых запросов', violations[0])
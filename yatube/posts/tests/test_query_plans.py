@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+
+from posts.models import Post, Group, User
+from posts.paginators import (CURSOR_NEXT, CURSOR_PREVIOUS, CursorPaginator,
+                              encode_cursor)
+from posts.views import POSTS_PER_PAGE
+
+
+def explain(queryset):
+    sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class FeedQueryPlanTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(username='post_author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.post_author,
+            group=cls.group,
+        )
+
+    def feed_querysets(self):
+        # Те же querysets, что строят view лент.
+        feeds = {
+            'index': Post.objects.feed(),
+            'group_posts': Post.objects.feed().filter(group=self.group),
+            'profile': Post.objects.feed().filter(author=self.post_author),
+        }
+        cursors = {
+            'first page': (None, None),
+            'next page': (encode_cursor(CURSOR_NEXT, self.post),
+                          'pub_date<?'),
+            'previous page': (encode_cursor(CURSOR_PREVIOUS, self.post),
+                              'pub_date>?'),
+        }
+        for feed, queryset in feeds.items():
+            paginator = CursorPaginator(queryset, POSTS_PER_PAGE)
+            for page, (cursor, bound) in cursors.items():
+                _, page_queryset = paginator.get_cursor_queryset(cursor)
+                yield f'{feed}, {page}', page_queryset, bound
+
+    def test_feed_queries_use_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN есть только в SQLite')
+        for name, queryset, bound in self.feed_querysets():
+            with self.subTest(feed=name):
+                plan = explain(queryset)
+                for step in plan:
+                    self.assertNotIn('TEMP B-TREE', step, plan)
+                    if step.startswith('SCAN'):
+                        self.assertIn('INDEX', step, plan)
+                if bound is None:
+                    continue
+                # Страница за курсором — поиск диапазона в индексе,
+                # а не проход по нему с начала ленты.
+                [posts_step] = [step for step in plan
+                                if 'posts_post ' in step]
+                self.assertTrue(posts_step.startswith('SEARCH'), plan)
+                self.assertIn(bound, posts_step, plan)
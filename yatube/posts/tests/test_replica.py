@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client, TransactionTestCase
+from django.urls import reverse
+
+from core.replica import PIN_COOKIE, sync_replica
+from posts.models import Post, User
+
+REPLICA = settings.REPLICA_DATABASE
+
+
+class ReplicaRoutingTest(TransactionTestCase):
+    """Реплика — SQLite-копия тестовой базы, снятая sync_replica()."""
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_dir = tempfile.mkdtemp()
+        connections.databases[REPLICA] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(cls.replica_dir, 'replica.sqlite3'),
+        }
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections.databases[REPLICA]
+        delattr(connections._connections, REPLICA)
+        shutil.rmtree(cls.replica_dir, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.post_author = User.objects.create(username='post_author')
+        self.synced_post = Post.objects.create(text='Уже на реплике',
+                                               author=self.post_author)
+        sync_replica()
+        self.fresh_post = Post.objects.create(text='Только в основной базе',
+                                              author=self.post_author)
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def test_read_views_use_replica(self):
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'post_author'}),
+            reverse('posts:api_posts'),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.guest_client.get(address)
+                self.assertContains(response, self.synced_post.text)
+                self.assertNotContains(response, self.fresh_post.text)
+
+    def test_writes_go_to_primary_and_pin_the_writer(self):
+        response = self.authorized_client.post(
+            reverse('posts:post_create'), data={'text': 'Свой новый пост'})
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'],
+                         settings.REPLICA_PIN_SECONDS)
+        self.assertTrue(Post.objects.filter(text='Свой новый пост').exists())
+        self.assertFalse(Post.objects.using(REPLICA).filter(
+            text='Свой новый пост').exists())
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Свой новый пост')
+        self.assertContains(response, self.fresh_post.text)
+
+    def test_pinned_writer_skips_fragments_cached_from_replica(self):
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'post_author'}),
+        )
+        reader_client = Client()
+        reader_client.force_login(
+            User.objects.create(username='reader'))
+        for address in addresses:
+            reader_client.get(address)
+        self.authorized_client.post(
+            reverse('posts:post_create'), data={'text': 'Свой новый пост'})
+        for address in addresses:
+            with self.subTest(address=address):
+                reader_client.get(address)
+                response = self.authorized_client.get(address)
+                self.assertContains(response, 'Свой новый пост')
+
+    def test_reads_without_writes_do_not_pin(self):
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_sync_changes_validators_of_replica_pages(self):
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:feed_rss'),
+            reverse('posts:api_posts'),
+        )
+        for address in addresses:
+            with self.subTest(address=address):
+                post = Post.objects.create(text=f'Новое для {address}',
+                                           author=self.post_author)
+                etag = self.guest_client.get(address)['ETag']
+                sync_replica()
+                response = Client().get(address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, post.text)
+
+    def test_sync_invalidates_fragments_read_from_replica(self):
+        reader_client = Client()
+        reader_client.force_login(User.objects.create(username='reader'))
+        reader_client.get(reverse('posts:index'))
+        sync_replica()
+        response = reader_client.get(reverse('posts:index'))
+        self.assertContains(response, self.fresh_post.text)
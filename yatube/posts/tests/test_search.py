@@ -0,0 +1,77 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, Group, User
+
+
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Лев Толстой — зеркало русской революции',
+            author=cls.post_author,
+            group=cls.group,
+        )
+        cls.other_post = Post.objects.create(
+            text='Анна Каренина и Толстой, Толстой, Толстой',
+            author=cls.post_author,
+        )
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def search(self, query):
+        response = self.guest_client.get(reverse('posts:search'),
+                                         {'q': query})
+        return list(response.context['page_obj'])
+
+    def test_search_finds_posts(self):
+        self.assertEqual(self.search('зеркало'), [self.post])
+        self.assertEqual(self.search('ЗЕРКАЛО революции'), [self.post])
+        self.assertEqual(self.search('нет такого слова'), [])
+
+    def test_results_are_ranked(self):
+        self.assertEqual(self.search('толстой'),
+                         [self.other_post, self.post])
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.create(text='Черновик', author=self.post_author)
+        self.assertEqual(self.search('черновик'), [post])
+        post.text = 'Новый текст'
+        post.save()
+        self.assertEqual(self.search('черновик'), [])
+        self.assertEqual(self.search('новый'), [post])
+        post.delete()
+        self.assertEqual(self.search('новый'), [])
+
+    def test_fts_syntax_in_query_is_safe(self):
+        for query in ('"', 'NEAR(', 'толстой OR', '*', ''):
+            with self.subTest(query=query):
+                response = self.guest_client.get(reverse('posts:search'),
+                                                 {'q': query})
+                self.assertEqual(response.status_code, 200)
+
+    def test_admin_search_uses_index(self):
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'зеркало'})
+        self.assertEqual(list(response.context['cl'].result_list),
+                         [self.post])
+
+    def test_admin_search_returns_every_match(self):
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'толстой'})
+        self.assertCountEqual(response.context['cl'].result_list,
+                              [self.post, self.other_post])
@@ -0,0 +1,118 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.checks import check_session_cache
+from core.sessions import SessionStore
+from posts.models import User
+
+
+def session_queries(context):
+    return [query['sql'] for query in context.captured_queries
+            if 'django_session' in query['sql']]
+
+
+class CachedSessionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_authenticated_request_reads_session_from_cache(self):
+        user = User.objects.create_user(username='reader',
+                                        password='password')
+        client = Client()
+        client.login(username='reader', password='password')
+        client.get(reverse('posts:index'))
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(reverse('posts:index'))
+        self.assertEqual(response.context['user'], user)
+        self.assertEqual(session_queries(context), [])
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            client.get(reverse('posts:index'))
+        self.assertEqual(len(session_queries(context)), 1)
+
+    def test_logout_closes_session_for_every_reader(self):
+        User.objects.create_user(username='reader', password='password')
+        client = Client()
+        client.login(username='reader', password='password')
+        # Тот же cookie сессии — например, запросы в другой процесс.
+        other_client = Client()
+        other_client.cookies[settings.SESSION_COOKIE_NAME] = (
+            client.cookies[settings.SESSION_COOKIE_NAME].value)
+        other_client.get(reverse('posts:index'))
+        client.get(reverse('users:logout'))
+        response = other_client.get(reverse('posts:index'))
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_unchanged_session_is_not_written(self):
+        session = SessionStore()
+        session['answer'] = 42
+        session.save()
+
+        session = SessionStore(session.session_key)
+        session['answer'] = 42
+        with CaptureQueriesContext(connection) as context:
+            session.save()
+        self.assertEqual(session_queries(context), [])
+
+        session['answer'] = 43
+        with CaptureQueriesContext(connection) as context:
+            session.save()
+        self.assertEqual(len(session_queries(context)), 1)
+        cache.clear()
+        self.assertEqual(SessionStore(session.session_key)['answer'], 43)
+
+    def test_session_near_expiry_is_extended(self):
+        session = SessionStore()
+        session['answer'] = 42
+        session.save()
+        Session.objects.filter(session_key=session.session_key).update(
+            expire_date=timezone.now() + timedelta(hours=1))
+        cache.clear()
+
+        session = SessionStore(session.session_key)
+        self.assertEqual(session['answer'], 42)
+        self.assertTrue(session.modified)
+        session.save()
+        expire_date = Session.objects.get(
+            session_key=session.session_key).expire_date
+        self.assertGreater(expire_date, timezone.now() + timedelta(days=7))
+
+    def test_clear_expired_sessions_in_chunks(self):
+        for _ in range(5):
+            session = SessionStore()
+            session.save()
+        Session.objects.update(expire_date=timezone.now() - timedelta(days=1))
+        alive = SessionStore()
+        alive.save()
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as context:
+            call_command('clear_expired_sessions', chunk=2, pause=0,
+                         stdout=out)
+        self.assertIn('Удалено сессий: 5', out.getvalue())
+        deletes = [sql for sql in session_queries(context)
+                   if sql.startswith('DELETE')]
+        self.assertEqual(len(deletes), 3)
+        self.assertEqual(list(Session.objects.values_list(
+            'session_key', flat=True)), [alive.session_key])
+
+
+class SessionCacheCheckTest(SimpleTestCase):
+    def test_process_local_session_cache_fails_check(self):
+        self.assertEqual(check_session_cache(None), [])
+        locmem = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem):
+            errors = check_session_cache(None)
+        self.assertEqual([error.id for error in errors], ['core.E002'])
@@ -0,0 +1,120 @@
+import re
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import (Client, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import reverse
+
+from core.checks import check_shared_cache
+from posts.models import FeedSnapshot, Post, Group, User
+from posts.snapshots import refresh_snapshots
+from posts.views import POSTS_PER_PAGE
+
+
+@override_settings(FEED_SNAPSHOT_PAGES=2, FEED_SNAPSHOT_GROUPS=1)
+class FeedSnapshotTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(
+            username='post_author',
+            first_name='Лев',
+            last_name='Толстой',
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(POSTS_PER_PAGE * 3):
+            Post.objects.create(text=f'Тестовый текст {i}',
+                                author=cls.post_author, group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.post_author)
+
+    def get(self, address, **params):
+        return self.authorized_client.get(address, params)
+
+    @staticmethod
+    def text(response):
+        # Снимок и живая страница отличаются только отступами.
+        return re.sub(r'\s+', ' ', response.content.decode())
+
+    def test_views_serve_snapshot_like_live_page(self):
+        addresses = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': 'test-slug'}),
+        )
+        live = {address: self.text(self.get(address)) for address in addresses}
+        self.assertEqual(refresh_snapshots(POSTS_PER_PAGE),
+                         ['global', f'group:{self.group.pk}'])
+        cache.clear()
+        refresh_snapshots(POSTS_PER_PAGE)
+        for address in addresses:
+            with self.subTest(address=address):
+                response = self.get(address)
+                self.assertIsNotNone(response.context['snapshot'])
+                self.assertEqual(self.text(response), live[address])
+
+    def test_first_pages_follow_cursor(self):
+        refresh_snapshots(POSTS_PER_PAGE)
+        address = reverse('posts:index')
+        first = self.get(address).context['page_obj']
+        response = self.get(address, cursor=first.next_cursor)
+        self.assertIsNotNone(response.context['snapshot'])
+        self.assertContains(response,
+                            f'Тестовый текст {POSTS_PER_PAGE * 2 - 1}')
+        self.assertTrue(response.context['page_obj'].has_previous())
+        # Третья страница в снимки не входит.
+        third = self.get(address,
+                         cursor=response.context['page_obj'].next_cursor)
+        self.assertIsNone(third.context['snapshot'])
+        self.assertEqual(len(third.context['page_obj']), POSTS_PER_PAGE)
+
+    def test_write_retires_only_affected_snapshots(self):
+        other_group = Group.objects.create(title='Другая группа',
+                                           slug='other-slug',
+                                           description='Тестовое описание')
+        refresh_snapshots(POSTS_PER_PAGE)
+        Post.objects.create(text='Свежий пост', author=self.post_author,
+                            group=other_group)
+        response = self.get(reverse('posts:index'))
+        self.assertIsNone(response.context['snapshot'])
+        self.assertContains(response, 'Свежий пост')
+        response = self.get(reverse('posts:group_list',
+                                    kwargs={'slug': 'test-slug'}))
+        self.assertIsNotNone(response.context['snapshot'])
+        self.assertEqual(refresh_snapshots(POSTS_PER_PAGE), ['global'])
+        response = self.get(reverse('posts:index'))
+        self.assertIsNotNone(response.context['snapshot'])
+        self.assertContains(response, 'Свежий пост')
+
+    def test_author_rename_retires_snapshots(self):
+        refresh_snapshots(POSTS_PER_PAGE)
+        self.post_author.first_name = 'Алексей'
+        self.post_author.save()
+        self.assertEqual(len(refresh_snapshots(POSTS_PER_PAGE)), 2)
+        self.assertContains(self.get(reverse('posts:index')),
+                            'Алексей Толстой')
+
+    def test_command_refreshes_once(self):
+        out = StringIO()
+        call_command('refresh_snapshots', stdout=out)
+        self.assertIn('global', out.getvalue())
+        self.assertEqual(FeedSnapshot.objects.filter(feed='global').count(),
+                         2)
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    def test_process_local_cache_fails_check(self):
+        self.assertEqual(check_shared_cache(None), [])
+        locmem = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem):
+            errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ['core.E001'])
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase
+
+from core.sqlite import current_pragmas, pragma_statements
+
+
+class SqlitePragmasTest(TestCase):
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Настройки PRAGMA есть только у SQLite')
+
+    def test_test_connection_is_tuned(self):
+        pragmas = current_pragmas(connection)
+        self.assertEqual(pragmas['synchronous'], 1)
+        self.assertEqual(pragmas['busy_timeout'],
+                         settings.SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(pragmas['cache_size'],
+                         settings.SQLITE_PRAGMAS['cache_size'])
+        self.assertEqual(pragmas['temp_store'], 2)
+
+    def test_file_database_switches_to_wal(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            wrapper = DatabaseWrapper({
+                **connection.settings_dict,
+                'NAME': os.path.join(tmp_dir, 'db.sqlite3'),
+            }, alias='tuning-check')
+            try:
+                pragmas = current_pragmas(wrapper)
+            finally:
+                wrapper.close()
+        self.assertEqual(pragmas['journal_mode'], 'wal')
+        self.assertEqual(pragmas['mmap_size'],
+                         settings.SQLITE_PRAGMAS['mmap_size'])
+
+
+class PragmaStatementsTest(SimpleTestCase):
+    def test_statements_follow_fixed_order(self):
+        statements = list(pragma_statements(
+            {'synchronous': 'normal', 'journal_mode': 'wal'}))
+        self.assertEqual(statements, [
+            'PRAGMA journal_mode = wal',
+            'PRAGMA synchronous = normal',
+        ])
+
+    def test_bad_pragmas_are_rejected(self):
+        cases = (
+            {'foreign_keys': 0},
+            {'journal_mode': 'wal; DROP TABLE posts_post'},
+        )
+        for pragmas in cases:
+            with self.subTest(pragmas=pragmas):
+                with self.assertRaises(ValueError):
+                    list(pragma_statements(pragmas))
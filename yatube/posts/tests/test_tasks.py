@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.cache import bump_tag_versions, get_tag_versions
+from core.models import Task
+from core.tasks import claim_tasks, enqueue, enqueue_on_commit, requeue_stale
+
+MISSING_TASK = 'core.tasks.missing_task'
+
+
+@override_settings(TASK_RETRY_BACKOFF=10, TASK_MAX_ATTEMPTS=3)
+class TaskQueueTest(TestCase):
+    def run_worker(self):
+        out = StringIO()
+        call_command('run_tasks', once=True, threads=0, stdout=out)
+        return out.getvalue()
+
+    def test_task_runs_and_is_deleted(self):
+        version = get_tag_versions(['task-test'])['task-test']
+        enqueue(bump_tag_versions, 'task-test')
+        self.run_worker()
+        self.assertEqual(get_tag_versions(['task-test'])['task-test'],
+                         version + 1)
+        self.assertFalse(Task.objects.exists())
+
+    def test_dedup_key_skips_pending_duplicates(self):
+        self.assertIsNotNone(enqueue(MISSING_TASK, dedup_key='same'))
+        self.assertIsNone(enqueue(MISSING_TASK, dedup_key='same'))
+        self.assertIsNotNone(enqueue(MISSING_TASK, dedup_key='other'))
+        self.assertEqual(Task.objects.count(), 2)
+
+        # Взятая воркером задача уже не мешает поставить новую.
+        claim_tasks(10)
+        self.assertIsNotNone(enqueue(MISSING_TASK, dedup_key='same'))
+
+    def test_failed_task_is_retried_with_backoff(self):
+        enqueue(MISSING_TASK)
+        self.assertIn('с ошибкой: 1', self.run_worker())
+        task = Task.objects.get()
+        self.assertEqual(task.status, Task.PENDING)
+        self.assertEqual(task.attempts, 1)
+        self.assertIn('ImportError', task.last_error)
+        self.assertGreater(task.run_at,
+                           timezone.now() + timedelta(seconds=5))
+        self.assertEqual(claim_tasks(10), [])
+
+        Task.objects.update(run_at=timezone.now())
+        self.run_worker()
+        task.refresh_from_db()
+        self.assertEqual(task.attempts, 2)
+        # Пауза удваивается с каждой попыткой.
+        self.assertGreater(task.run_at,
+                           timezone.now() + timedelta(seconds=15))
+
+    def test_task_fails_after_last_attempt(self):
+        enqueue(MISSING_TASK, max_attempts=1)
+        self.run_worker()
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+        self.assertEqual(claim_tasks(10), [])
+
+    @override_settings(TASK_LOCK_TIMEOUT=60)
+    def test_stale_task_is_requeued(self):
+        enqueue(MISSING_TASK, dedup_key='stale')
+        enqueue(MISSING_TASK, dedup_key='running')
+        claim_tasks(10)
+        # Пока первая висела, такую же поставили заново.
+        enqueue(MISSING_TASK, dedup_key='stale')
+        requeue_stale(timezone.now() + timedelta(seconds=120))
+        self.assertEqual(
+            sorted(Task.objects.values_list('dedup_key', 'status')),
+            [('running', Task.PENDING), ('stale', Task.PENDING)])
+
+
+class TaskOnCommitTest(TransactionTestCase):
+    def test_enqueue_on_commit(self):
+        try:
+            with transaction.atomic():
+                enqueue_on_commit(MISSING_TASK)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(Task.objects.exists())
+
+        with transaction.atomic():
+            enqueue_on_commit(MISSING_TASK, dedup_key='key')
+            self.assertFalse(Task.objects.exists())
+        self.assertEqual(Task.objects.get().dedup_key, 'key')
+
+    def test_worker_threads(self):
+        for i in range(5):
+            enqueue(bump_tag_versions, f'task-{i}')
+        out = StringIO()
+        call_command('run_tasks', once=True, threads=2, stdout=out)
+        self.assertIn('Выполнено: 5', out.getvalue())
+        self.assertFalse(Task.objects.exists())
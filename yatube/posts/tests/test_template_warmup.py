@@ -0,0 +1,33 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase
+
+from core.template_warmup import template_names, warm_templates
+
+
+class TemplateWarmupTest(SimpleTestCase):
+    def setUp(self):
+        self.engine = engines['django']
+        self.loader = self.engine.engine.template_loaders[0]
+        self.loader.reset()
+
+    def test_project_and_app_templates_are_found(self):
+        names = template_names(self.engine)
+        for name in ('base.html', 'posts/index.html',
+                     'posts/includes/paginator.html', 'admin/base.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, names)
+
+    def test_warmup_fills_cached_loader(self):
+        report = warm_templates()
+        self.assertEqual([row for row in report if row[2]], [])
+        self.assertIn('posts/index.html', self.loader.get_template_cache)
+        self.assertIn('base.html', self.loader.get_template_cache)
+
+    def test_command_prints_report(self):
+        out = StringIO()
+        call_command('warm_templates', stdout=out)
+        self.assertIn('posts/index.html', out.getvalue())
+        self.assertIn('Шаблонов:', out.getvalue())
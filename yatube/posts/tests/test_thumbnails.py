@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, TransactionTestCase
+from django.test import override_settings
+from django.urls import reverse
+from sorl.thumbnail import default, get_thumbnail
+
+from core.models import Task
+from posts.models import Post, User
+from posts.thumbnails import (attach_thumbnails, generate_thumbnails,
+                              thumbnail_file, thumbnail_sizes)
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def uploaded_gif(name='small.gif'):
+    return SimpleUploadedFile(name=name, content=SMALL_GIF,
+                              content_type='image/gif')
+
+
+def thumbnails_exist(image):
+    return all(default.kvstore.get(thumbnail_file(image, size))
+               for size in thumbnail_sizes())
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostThumbnailTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.post_author = User.objects.create(username='post_author')
+        # Воркер очереди тут не запущен, миниатюр ещё нет.
+        cls.posts = [
+            Post.objects.create(text=f'Тестовый текст {i}',
+                                author=cls.post_author,
+                                image=uploaded_gif(f'small-{i}.gif'))
+            for i in range(10)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_thumbnail_file_matches_sorl_name(self):
+        image = self.posts[0].image
+        for size, (geometry, options) in thumbnail_sizes().items():
+            with self.subTest(size=size):
+                self.assertEqual(thumbnail_file(image, size).name,
+                                 get_thumbnail(image, geometry,
+                                               **options).name)
+
+    def test_feed_shows_original_until_thumbnail_is_ready(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, self.posts[0].image.url)
+        self.assertFalse(thumbnails_exist(self.posts[0].image))
+
+        generate_thumbnails(self.posts[0].image)
+        cache.clear()
+        response = self.client.get(reverse('posts:index'))
+        feed_thumbnail = thumbnail_file(self.posts[0].image, 'feed')
+        self.assertContains(response, feed_thumbnail.url)
+
+    def test_page_lookup_needs_no_per_image_queries(self):
+        for post in self.posts:
+            generate_thumbnails(post.image)
+        cache.clear()
+        posts = list(Post.objects.feed())
+        with self.assertNumQueries(1):
+            attach_thumbnails(posts, 'feed')
+        posts = list(Post.objects.feed())
+        with self.assertNumQueries(0):
+            attach_thumbnails(posts, 'feed')
+        self.assertTrue(all(post.thumbnail for post in posts))
+
+    def test_pregenerate_command(self):
+        out = StringIO()
+        call_command('pregenerate_thumbnails', workers=0, stdout=out)
+        self.assertIn('с новыми миниатюрами: 10', out.getvalue())
+        for post in self.posts:
+            self.assertTrue(thumbnails_exist(post.image))
+
+        out = StringIO()
+        call_command('pregenerate_thumbnails', workers=0, stdout=out)
+        self.assertIn('с новыми миниатюрами: 0', out.getvalue())
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostImageUploadTest(TransactionTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.post_author = User.objects.create(username='post_author')
+        self.client = Client()
+        self.client.force_login(self.post_author)
+
+    def test_upload_queues_thumbnails_after_commit(self):
+        self.client.post(reverse('posts:post_create'), {
+            'text': 'Пост с картинкой',
+            'image': uploaded_gif(),
+        })
+        post = Post.objects.get()
+        self.assertTrue(post.image.name.startswith('posts/small'))
+        self.assertTrue(os.path.exists(post.image.path))
+        self.assertFalse(thumbnails_exist(post.image))
+        self.assertEqual(Task.objects.get().dedup_key,
+                         f'thumbnails:{post.pk}')
+
+        call_command('run_tasks', once=True, threads=0, stdout=StringIO())
+        self.assertTrue(thumbnails_exist(post.image))
+
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk}))
+        self.assertContains(response,
+                            thumbnail_file(post.image, 'detail').url)
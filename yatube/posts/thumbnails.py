@@ -0,0 +1,85 @@
+"""Миниатюры картинок постов.
+
+Все размеры из settings.POST_THUMBNAIL_SIZES готовит воркер очереди
+задач сразу после сохранения поста (старые картинки — manage.py
+pregenerate_thumbnails), а не sorl при первом показе ленты. Шаблоны
+только ищут готовые миниатюры в KV-хранилище sorl: на страницу ленты —
+одно обращение к кешу и не больше одного запроса к базе, а пока
+миниатюры нет, показывается сама картинка.
+"""
+from django.conf import settings
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend as BaseThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile, deserialize_image_file
+from sorl.thumbnail.kvstores.base import add_prefix
+from sorl.thumbnail.kvstores.cached_db_kvstore import EMPTY_VALUE
+from sorl.thumbnail.kvstores.cached_db_kvstore import KVStore as BaseKVStore
+from sorl.thumbnail.models import KVStore as KVStoreModel
+
+
+class ThumbnailBackend(BaseThumbnailBackend):
+    def thumbnail_file(self, file_, geometry_string, **options):
+        """ImageFile миниатюры — то же имя, что даст get_thumbnail, но без
+        обращения к хранилищу и без генерации."""
+        source = ImageFile(file_)
+        if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(thumbnail_settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return ImageFile(name, default.storage)
+
+
+class KVStore(BaseKVStore):
+    def get_many(self, image_files):
+        """{ключ ImageFile: найденный ImageFile} для всех файлов сразу:
+        один get_many кеша и один запрос к базе на то, чего нет в кеше."""
+        keys = {add_prefix(image_file.key): image_file.key
+                for image_file in image_files}
+        values = self.cache.get_many(list(keys))
+        missing = [key for key in keys if key not in values]
+        if missing:
+            found = dict(KVStoreModel.objects.filter(
+                key__in=missing).values_list('key', 'value'))
+            self.cache.set_many(
+                found, thumbnail_settings.THUMBNAIL_CACHE_TIMEOUT)
+            values.update(found)
+        # Отсутствие миниатюры не кешируем: её вот-вот создаст воркер.
+        return {keys[key]: deserialize_image_file(value)
+                for key, value in values.items() if value != EMPTY_VALUE}
+
+
+def thumbnail_sizes():
+    return settings.POST_THUMBNAIL_SIZES
+
+
+def thumbnail_file(image, size):
+    geometry, options = thumbnail_sizes()[size]
+    return default.backend.thumbnail_file(image, geometry, **options)
+
+
+def attach_thumbnails(posts, size):
+    """Проставить post.thumbnail (ImageFile или None) всем постам."""
+    posts = [post for post in posts if post.image]
+    files = {post.pk: thumbnail_file(post.image, size) for post in posts}
+    found = default.kvstore.get_many(files.values()) if files else {}
+    for post in posts:
+        post.thumbnail = found.get(files[post.pk].key)
+
+
+def generate_thumbnails(image):
+    """Создать недостающие миниатюры всех размеров; True, если создана
+    хоть одна."""
+    created = False
+    for size, (geometry, options) in thumbnail_sizes().items():
+        if default.kvstore.get(thumbnail_file(image, size)) is not None:
+            continue
+        default.backend.get_thumbnail(image, geometry, **options)
+        created = True
+    return created
@@ -1,5 +1,13 @@
 from django.urls import path
-from . import views
+from core.replica import replica_reads
+from . import api, feeds, views
+from .conditions import (conditional_page, group_validators, index_validators,
+                         profile_validators)
+
+
+def feed_view(feed, validators):
+    return replica_reads(conditional_page(validators)(feed))
+
 
 app_name = 'posts'
 
@@ -10,4 +18,35 @@ urlpatterns = [
     path("posts/<int:pk>/edit/", views.post_edit, name="post_edit"),
     path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
     path("profile/<str:username>/", views.profile, name="profile"),
+    path("search/", views.search, name="search"),
+    path("feed/rss/",
+         feed_view(feeds.LatestPostsFeed(), index_validators),
+         name="feed_rss"),
+    path("feed/atom/",
+         feed_view(feeds.LatestPostsAtomFeed(), index_validators),
+         name="feed_atom"),
+    path("group/<slug:slug>/rss/",
+         feed_view(feeds.GroupPostsFeed(), group_validators),
+         name="group_feed_rss"),
+    path("group/<slug:slug>/atom/",
+         feed_view(feeds.GroupPostsAtomFeed(), group_validators),
+         name="group_feed_atom"),
+    path("profile/<str:username>/rss/",
+         feed_view(feeds.AuthorPostsFeed(), profile_validators),
+         name="profile_feed_rss"),
+    path("profile/<str:username>/atom/",
+         feed_view(feeds.AuthorPostsAtomFeed(), profile_validators),
+         name="profile_feed_atom"),
+    path("api/v1/posts/", api.posts, name="api_posts"),
+    path("api/v1/posts/<int:post_id>/", api.post_detail,
+         name="api_post_detail"),
+    path("api/v1/groups/<slug:slug>/posts/", api.group_posts,
+         name="api_group_posts"),
+    path("api/v1/profiles/<str:username>/posts/", api.profile_posts,
+         name="api_profile_posts"),
+    path("export.<str:fmt>", views.export_all, name="export_all"),
+    path("group/<slug:slug>/export.<str:fmt>", views.export_group,
+         name="export_group"),
+    path("profile/<str:username>/export.<str:fmt>", views.export_profile,
+         name="export_profile"),
 ]
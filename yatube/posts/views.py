@@ -1,63 +1,111 @@
+from urllib.parse import urlencode
+
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
-from django.core.paginator import Paginator
-from .models import Post, Group, User
+from core.cache import tag_page
+from core.replica import replica_reads
+from .cache import GLOBAL_FEED, author_feed, group_feed, post_tag
+from .conditions import (conditional_page, group_validators, index_validators,
+                         post_validators, profile_validators)
+from .export import EXPORT_FORMATS, export_lines
+from .models import AuthorCounter, Post, Group, User
 from .forms import PostForm
+from .paginators import CountedPaginator, get_page
+from .search import search_posts
+from .snapshots import get_snapshot_page
 from django.contrib.auth.decorators import login_required
 
 POSTS_PER_PAGE = 10
 
 
+@replica_reads
+@conditional_page(index_validators)
 def index(request):
-    post_list = Post.objects.all()
-    paginator = Paginator(post_list, POSTS_PER_PAGE)
-
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    tag_page(request, GLOBAL_FEED)
+    snapshot, page_obj = get_snapshot_page(request, GLOBAL_FEED,
+                                           POSTS_PER_PAGE)
+    if snapshot is None:
+        post_list = Post.objects.feed()
+        page_obj = get_page(request, post_list, POSTS_PER_PAGE)
 
     context = {
         'page_obj': page_obj,
+        'feed': GLOBAL_FEED,
+        'snapshot': snapshot,
     }
     return render(request, 'posts/index.html', context)
 
 
+@replica_reads
+@conditional_page(group_validators)
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
+    tag_page(request, group_feed(group.pk))
     title = group.title
-    group_post_list = Post.objects.filter(group=group).all()
-    paginator = Paginator(group_post_list, POSTS_PER_PAGE)
-
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    snapshot, page_obj = get_snapshot_page(request, group_feed(group.pk),
+                                           POSTS_PER_PAGE)
+    if snapshot is None:
+        group_post_list = Post.objects.feed().filter(group=group)
+        page_obj = get_page(request, group_post_list, POSTS_PER_PAGE,
+                            group.posts_count)
 
     context = {
         'title': title,
         'group': group,
         'page_obj': page_obj,
+        'feed': group_feed(group.pk),
+        'snapshot': snapshot,
     }
     return render(request, template, context)
 
 
+@replica_reads
+@conditional_page(profile_validators)
 def profile(request, username):
     template = 'posts/profile.html'
     author = get_object_or_404(User, username=username)
-    posts = Post.objects.filter(author__username=username)
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    tag_page(request, author_feed(author.pk))
+    posts = Post.objects.feed().filter(author=author)
+    posts_count = AuthorCounter.get_count(author)
+    page_obj = get_page(request, posts, POSTS_PER_PAGE, posts_count)
     context = {
         'author': author,
+        'posts_count': posts_count,
         'posts': posts,
         'page_obj': page_obj,
+        'feed': author_feed(author.pk),
     }
     return render(request, template, context)
 
 
+@replica_reads
+@conditional_page(post_validators)
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, id=post_id)
+    tag_page(request, post_tag(post_id))
+    post = get_object_or_404(Post.objects.detail(), id=post_id)
+    tag_page(request, author_feed(post.author_id))
+    if post.group_id is not None:
+        tag_page(request, group_feed(post.group_id))
     context = {
         "post": post,
+        "posts_count": AuthorCounter.get_count(post.author_id),
+    }
+    return render(request, template, context)
+
+
+def search(request):
+    template = 'posts/search.html'
+    query = request.GET.get('q', '').strip()
+    results = search_posts(Post.objects.feed(), query)
+    paginator = CountedPaginator(results, POSTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': urlencode({'q': query}) + '&',
     }
     return render(request, template, context)
 
@@ -66,7 +114,7 @@ def post_detail(request, post_id):
 def post_create(request):
     username = request.user.username
     template = 'posts/create_post.html'
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         post_create = form.save(commit=False)
         post_create.author = request.user
@@ -84,7 +132,8 @@ def post_edit(request, pk):
     edit_post = get_object_or_404(Post, id=pk)
     if request.user != edit_post.author:
         return redirect('posts:post_detail', pk)
-    form = PostForm(request.POST or None, instance=edit_post)
+    form = PostForm(request.POST or None, files=request.FILES or None,
+                    instance=edit_post)
     if form.is_valid():
         form.save()
         return redirect('posts:post_detail', pk)
@@ -94,3 +143,38 @@ def post_edit(request, pk):
         "post_id": pk,
     }
     return render(request, template, context)
+
+
+def stream_export(queryset, fmt, filename):
+    if fmt not in EXPORT_FORMATS:
+        raise Http404
+    response = StreamingHttpResponse(export_lines(queryset, fmt),
+                                     content_type=EXPORT_FORMATS[fmt])
+    response['Content-Disposition'] = (
+        f'attachment; filename="{filename}.{fmt}"')
+    return response
+
+
+@login_required
+def export_profile(request, username, fmt):
+    author = get_object_or_404(User, username=username)
+    if request.user != author and not request.user.is_staff:
+        raise PermissionDenied
+    return stream_export(Post.objects.filter(author=author), fmt,
+                         f'posts-{author.username}')
+
+
+@login_required
+def export_group(request, slug, fmt):
+    if not request.user.is_staff:
+        raise PermissionDenied
+    group = get_object_or_404(Group, slug=slug)
+    return stream_export(Post.objects.filter(group=group), fmt,
+                         f'posts-group-{group.slug}')
+
+
+@login_required
+def export_all(request, fmt):
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return stream_export(Post.objects.all(), fmt, 'posts')
@@ -1,4 +1,8 @@
+import atexit
 import os
+import shutil
+import sys
+import tempfile
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -13,6 +17,9 @@ SECRET_KEY = 'uqok*0%qe0&tbdbp#z)2bwu=s(r@f=+qv64@c4-^g!+f2qdeyi'
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# Запущены тесты: manage.py test или pytest.
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
 ALLOWED_HOSTS = [
     'localhost',
     '127.0.0.1',
@@ -30,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'sorl.thumbnail',
     'posts.apps.PostsConfig',
     'yatube_project.apps.YatubeProjectConfig',
     'users.apps.UsersConfig',
@@ -39,12 +47,16 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.AnonymousPageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -54,6 +66,9 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
+        # Без DEBUG Django сам оборачивает загрузчики в cached.Loader, и
+        # wsgi.py заранее прогревает его кеш (core.template_warmup). С
+        # DEBUG шаблоны читаются заново, и правки видны сразу.
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -77,8 +92,167 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Держим соединение между запросами вместо открытия на каждый.
+        'CONN_MAX_AGE': int(os.environ.get('YATUBE_CONN_MAX_AGE', 60)),
+    }
+}
+
+# Применяются к каждому новому соединению (core.sqlite).
+SQLITE_PRAGMAS = {
+    # Читатели не ждут писателя, писатель не ждёт читателей.
+    'journal_mode': 'wal',
+    # В WAL это безопасно при сбое приложения и сильно дешевле FULL.
+    'synchronous': 'normal',
+    # Ждать освободившуюся блокировку вместо «database is locked».
+    'busy_timeout': 5000,
+    # Отрицательное значение — в КиБ: 64 МиБ кеша страниц.
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+# Реплика только для чтения: например, копия db.sqlite3, которую
+# обновляет manage.py sync_replica. Без неё всё читается из default.
+REPLICA_DATABASE = 'replica'
+if os.environ.get('YATUBE_REPLICA_DB'):
+    DATABASES[REPLICA_DATABASE] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['YATUBE_REPLICA_DB'],
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.replica.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает только из default.
+REPLICA_PIN_SECONDS = 15
+
+
+# Кеш должен быть общим для всех процессов: веб-воркеров, run_tasks,
+# refresh_snapshots и команд manage.py. Через него идут версии лент,
+# подсказки снимков, сессии и счётчики feed_cache_stats; с кешем в
+# памяти процесса (locmem) всё это не доходит до соседей. В разработке
+# хватает файлового кеша в BASE_DIR/cache, в продакшене — memcached:
+# YATUBE_CACHE_BACKEND=django.core.cache.backends.memcached.MemcachedCache
+# YATUBE_CACHE_LOCATION=127.0.0.1:11211
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'YATUBE_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': os.environ.get(
+            'YATUBE_CACHE_LOCATION',
+            os.path.join(BASE_DIR, 'cache'),
+        ),
+        'KEY_PREFIX': 'yatube',
+        # Увеличить, если миграция меняет то, что лежит в кеше: старые
+        # записи просто перестанут находиться, очищать кеш не нужно.
+        'VERSION': 1,
     }
 }
+if TESTING:
+    # Тесты не видят и не чистят кеш запущенного сервера разработки, а
+    # каждый прогон начинает с пустого кеша.
+    CACHES['default'].update({
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': tempfile.mkdtemp(prefix='yatube-test-cache-'),
+    })
+    atexit.register(shutil.rmtree, CACHES['default']['LOCATION'], True)
+if CACHES['default']['BACKEND'].endswith('.FileBasedCache'):
+    # Версии лент, фрагменты, страницы, сессии и миниатюры живут в
+    # одном кеше: 300 записей по умолчанию им мало.
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': 10000}
+
+# Сколько живёт закешированный фрагмент ленты. Устаревшим он не станет:
+# запись в ленту меняет её версию.
+POSTS_FEED_CACHE_TIMEOUT = 60 * 5
+
+# Снимки первых страниц лент (posts.snapshots): сколько страниц
+# держать и для скольких самых активных групп.
+FEED_SNAPSHOT_PAGES = 3
+FEED_SNAPSHOT_GROUPS = 20
+
+# Срок жизни страниц в кеше для анонимов, если view не задал свой.
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+
+# Сессии читаются из кеша (core.sessions), а строка в базе
+# обновляется, только если данные изменились или до конца сессии
+# осталось меньше SESSION_EXPIRY_REFRESH секунд. Истёкшие удаляет
+# manage.py clear_expired_sessions порциями по SESSION_CLEANUP_CHUNK.
+SESSION_ENGINE = 'core.sessions'
+SESSION_EXPIRY_REFRESH = 60 * 60 * 24
+SESSION_CLEANUP_CHUNK = 1000
+
+
+# Сколько SQL-запросов можно view (по view_name) вместе с сессией и
+# пользователем; сверх бюджета — warning в лог yatube.queries.
+QUERY_BUDGETS = {
+    'posts:index': 5,
+    'posts:group_list': 5,
+    'posts:profile': 6,
+    'posts:post_detail': 5,
+    'posts:search': 4,
+    'posts:post_create': 12,
+    'posts:post_edit': 12,
+    'posts:feed_rss': 4,
+    'posts:feed_atom': 4,
+    'posts:group_feed_rss': 5,
+    'posts:group_feed_atom': 5,
+    'posts:profile_feed_rss': 5,
+    'posts:profile_feed_atom': 5,
+    'posts:api_posts': 4,
+    'posts:api_post_detail': 4,
+    'posts:api_group_posts': 5,
+    'posts:api_profile_posts': 5,
+    'users:signup': 6,
+    'users:login': 6,
+    'users:logout': 4,
+    'about:author': 2,
+    'about:tech': 2,
+}
+# Столько одинаковых запросов за один HTTP-запрос — уже N+1.
+QUERY_DUPLICATE_LIMIT = 5
+# В CI нарушение бюджета роняет запрос, а с ним и тест.
+QUERY_BUDGET_STRICT = os.environ.get('CI', '').lower() == 'true'
+
+# Профили запросов (core.profiling): доля случайно профилируемых
+# запросов, каталог для дампов и срок жизни токена profiling_token.
+PROFILING_SAMPLE_RATE = float(os.environ.get('YATUBE_PROFILING_RATE', 0))
+PROFILING_DIR = os.path.join(BASE_DIR, 'profiles')
+PROFILING_TOKEN_MAX_AGE = 60 * 60
+
+# Учёт запросов пишет по строке JSON на запрос с уровнем DEBUG,
+# нарушения бюджета — WARNING.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yatube.queries': {
+            'handlers': ['console'],
+            'level': os.environ.get('YATUBE_QUERY_LOG_LEVEL', 'WARNING'),
+        },
+        # Повторы и окончательные ошибки задач очереди.
+        'yatube.tasks': {
+            'handlers': ['console'],
+            'level': os.environ.get('YATUBE_TASK_LOG_LEVEL', 'WARNING'),
+        },
+        # Письма, которые не удалось отправить.
+        'yatube.mail': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+        # Отчёт о прогреве шаблонов при старте; DEBUG — по каждому.
+        'yatube.templates': {
+            'handlers': ['console'],
+            'level': os.environ.get('YATUBE_TEMPLATE_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
 
 
 # Password validation
@@ -120,8 +294,46 @@ USE_TZ = True
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 STATIC_URL = '/static/'
 
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_URL = '/media/'
+
+# Загрузки всегда пишутся во временный файл, а не в память, и при
+# сохранении переносятся в MEDIA_ROOT без копирования.
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Миниатюры картинок постов (posts.thumbnails): имя -> геометрия и
+# опции sorl. Все размеры готовит очередь задач сразу после сохранения
+# поста; POST_THUMBNAIL_WORKERS — потоки manage.py pregenerate_thumbnails.
+POST_THUMBNAIL_SIZES = {
+    'feed': ('960x339', {'crop': 'center', 'upscale': True}),
+    'detail': ('960', {'upscale': False}),
+}
+POST_THUMBNAIL_WORKERS = int(os.environ.get('YATUBE_THUMBNAIL_WORKERS', 2))
+THUMBNAIL_BACKEND = 'posts.thumbnails.ThumbnailBackend'
+THUMBNAIL_KVSTORE = 'posts.thumbnails.KVStore'
+
+# Очередь задач (core.tasks, воркер manage.py run_tasks): сколько раз
+# пробовать, пауза перед повтором (удваивается с каждой попыткой), и
+# через сколько секунд задача упавшего воркера снова уходит в очередь.
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_BACKOFF = 10
+TASK_RETRY_BACKOFF_MAX = 60 * 60
+TASK_LOCK_TIMEOUT = 60 * 10
+TASK_WORKER_THREADS = int(os.environ.get('YATUBE_TASK_THREADS', 4))
+
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма копятся в базе (core.mail) и уходят пачками через
+# OUTBOX_EMAIL_BACKEND из воркера очереди задач; в разработке и тестах
+# это файлы в EMAIL_FILE_PATH (каталог в .gitignore), в продакшене — SMTP.
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+OUTBOX_EMAIL_BACKEND = os.environ.get(
+    'YATUBE_EMAIL_BACKEND',
+    'django.core.mail.backends.filebased.EmailBackend',
+)
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
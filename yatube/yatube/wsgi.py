@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+# Компилируем шаблоны до первого запроса; с gunicorn --preload кеш
+# достаётся воркерам уже готовым. С DEBUG кеша шаблонов нет.
+if (os.environ.get('YATUBE_WARM_TEMPLATES', '1') == '1'
+        and not settings.DEBUG):
+    from core.template_warmup import log_report, warm_templates
+
+    log_report(warm_templates())